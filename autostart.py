@@ -0,0 +1,134 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+from libqtile.log_utils import logger
+
+CONTINUE = "continue"
+SKIP_DEPENDENTS = "skip_dependents"
+
+
+class Step(NamedTuple):
+    name: str
+    func: Callable[[], Any]
+    after: Tuple[str, ...] = ()
+    timeout: float = 30
+    on_failure: str = CONTINUE
+
+
+class StepResult(NamedTuple):
+    status: str
+    elapsed: float
+
+
+class Autostart:
+    """
+    Run startup steps off the event loop, each as soon as the steps it runs
+    `after` are done.
+
+    A step that fails or outlives its timeout either lets its dependents run
+    anyway (`CONTINUE`) or skips them (`SKIP_DEPENDENTS`). A timed out step
+    cannot be killed, it is only no longer waited for.
+    """
+
+    def __init__(self, steps: Sequence[Step]) -> None:
+        self.steps = {step.name: step for step in steps}
+        self.results: Dict[str, StepResult] = {}
+        self.elapsed = 0.0
+        self._listeners: List[Callable[["Autostart"], None]] = []
+        for step in steps:
+            for dependency in step.after:
+                if dependency not in self.steps:
+                    raise ValueError(f"{step.name} runs after unknown {dependency}")
+        self._check_cycles()
+
+    def _check_cycles(self) -> None:
+        done: set = set()
+        remaining = dict(self.steps)
+        while remaining:
+            ready = [
+                name
+                for name, step in remaining.items()
+                if all(dependency in done for dependency in step.after)
+            ]
+            if not ready:
+                raise ValueError(f"Cyclic autostart steps: {', '.join(remaining)}")
+            for name in ready:
+                done.add(name)
+                del remaining[name]
+
+    def on_finished(self, callback: Callable[["Autostart"], None]) -> None:
+        self._listeners.append(callback)
+
+    def run(self) -> None:
+        threading.Thread(target=self._run, name="autostart", daemon=True).start()
+
+    def _blocked(self, step: Step) -> bool:
+        return any(
+            self.results[dependency].status != "ok"
+            and self.steps[dependency].on_failure == SKIP_DEPENDENTS
+            for dependency in step.after
+        )
+
+    def _run(self) -> None:
+        started = time.monotonic()
+        self.results = {}
+        pending = dict(self.steps)
+        running: Dict[Future, Tuple[Step, float]] = {}
+        executor = ThreadPoolExecutor(
+            max_workers=len(self.steps), thread_name_prefix="autostart"
+        )
+
+        while pending or running:
+            for name, step in list(pending.items()):
+                if not all(dependency in self.results for dependency in step.after):
+                    continue
+                del pending[name]
+                if self._blocked(step):
+                    self.results[name] = StepResult("skipped", 0.0)
+                    continue
+                running[executor.submit(step.func)] = (step, time.monotonic())
+            if not running:
+                continue
+
+            now = time.monotonic()
+            next_deadline = min(
+                start + step.timeout for step, start in running.values()
+            )
+            done, _ = wait(
+                running,
+                timeout=max(0.0, next_deadline - now),
+                return_when=FIRST_COMPLETED,
+            )
+            now = time.monotonic()
+            for future in done:
+                step, start = running.pop(future)
+                if future.exception() is not None:
+                    logger.error(
+                        "Autostart step %s failed",
+                        step.name,
+                        exc_info=future.exception(),
+                    )
+                    self.results[step.name] = StepResult("failed", now - start)
+                else:
+                    self.results[step.name] = StepResult("ok", now - start)
+            for future, (step, start) in list(running.items()):
+                if now - start >= step.timeout:
+                    del running[future]
+                    logger.warning(
+                        "Autostart step %s timed out after %ss", step.name, step.timeout
+                    )
+                    self.results[step.name] = StepResult("timeout", now - start)
+
+        executor.shutdown(wait=False)
+        self.elapsed = time.monotonic() - started
+        logger.info(self.report())
+        for callback in self._listeners:
+            callback(self)
+
+    def report(self) -> str:
+        lines = [f"Autostart finished in {self.elapsed:.3f}s"]
+        for name, result in self.results.items():
+            lines.append(f"  {name:<20} {result.status:<8} {result.elapsed:8.3f}s")
+        return "\n".join(lines)
@@ -0,0 +1,209 @@
+import asyncio
+from typing import Callable, Dict, Iterator, List, Set, Tuple
+
+import xcffib
+import xcffib.dpms
+from libqtile import bar, hook, qtile
+from libqtile.log_utils import logger
+from libqtile.widget.base import _Widget
+
+from ticks import TickHandle
+
+VISIBILITY_HOOKS = (
+    "client_killed",
+    "client_managed",
+    "float_change",
+    "focus_change",
+    "layout_change",
+    "screens_reconfigured",
+    "setgroup",
+)
+
+
+def _polling(widget: _Widget) -> bool:
+    future = getattr(widget, "future", None)
+    return future is not None and not future.done()
+
+
+# When a cancelled timer was due, in event loop time, what it would have called
+# and with which arguments
+PendingCall = Tuple[float, Callable, tuple]
+
+
+def _pending_call(handle) -> PendingCall:
+    # Neither asyncio's timer handles nor ours expose their callback
+    func = handle._func if isinstance(handle, TickHandle) else handle._callback
+    return handle.when(), func, handle._args
+
+
+def _cancel_timers(widget: _Widget, cancelled: Dict[_Widget, List[PendingCall]]):
+    now = asyncio.get_running_loop().time()
+    for future in widget._futures:
+        # Those already run stay in the list until the widget prunes it. qtile
+        # keeps call_soon handles there too, they have no time to restore.
+        timer = isinstance(future, (asyncio.TimerHandle, TickHandle))
+        if timer and not future.cancelled() and future.when() >= now:
+            cancelled.setdefault(widget, []).append(_pending_call(future))
+        future.cancel()
+    widget._futures.clear()
+
+    # A poll already running in the executor schedules the next one when it
+    # is done, cancel that one too if the bar is still suspended by then
+    def cancel_next(_):
+        if widget.bar.suspended:
+            _cancel_timers(widget, cancelled)
+
+    if _polling(widget):
+        widget.future.add_done_callback(cancel_next)
+
+
+class Bar(bar.Bar):
+    """
+    Bar that can be suspended while it cannot be seen.
+
+    Suspending cancels its widgets' pending timers and skips bar redraws.
+    Resuming puts back the timers it cancelled, with the time they had left,
+    so overdue ones run right away, and redraws the bar. Widgets updated
+    some other way can define `suspend` and `resume` to stop and restart it.
+
+    Widgets that define `mouse_move` are also told when the pointer moves
+    within them, qtile only reports entering and leaving a widget.
+    """
+
+    def __init__(self, widgets, size, **config):
+        super().__init__(widgets, size, **config)
+        self.suspended = False
+        self._cancelled: Dict[_Widget, List[PendingCall]] = {}
+
+    def _configure(self, qtile, screen, reconfigure=False):
+        super()._configure(qtile, screen, reconfigure=reconfigure)
+        visibility.watch(self)
+
+    def _all_widgets(self) -> Iterator[_Widget]:
+        for widget in self.widgets:
+            yield widget
+            yield from getattr(widget, "children", ())
+
+    def draw(self):
+        if not self.suspended:
+            super().draw()
+
+    def process_pointer_motion(self, x: int, y: int) -> None:
+        previous = self.cursor_in
+        super().process_pointer_motion(x, y)
+        widget = self.cursor_in
+        if widget is not None and widget is previous and hasattr(widget, "mouse_move"):
+            widget.mouse_move(x - widget.offsetx, y - widget.offsety)
+
+    def suspend(self) -> None:
+        if self.suspended:
+            return
+        self.suspended = True
+        for widget in self._all_widgets():
+            _cancel_timers(widget, self._cancelled)
+            if hasattr(widget, "suspend"):
+                widget.suspend()
+
+    def resume(self) -> None:
+        if not self.suspended:
+            return
+        self.suspended = False
+        now = asyncio.get_running_loop().time()
+        for widget in self._all_widgets():
+            for when, func, args in self._cancelled.pop(widget, ()):
+                widget._futures.append(
+                    widget.qtile.call_later(max(0.0, when - now), func, *args)
+                )
+            if hasattr(widget, "resume"):
+                widget.resume()
+        self._cancelled.clear()
+        self.draw()
+
+    def kill_window(self):
+        visibility.forget(self)
+        super().kill_window()
+
+    def finalize(self):
+        visibility.forget(self)
+        super().finalize()
+
+
+class VisibilityMonitor:
+    """
+    Suspend the bars of screens showing a fullscreen window, and every bar
+    while DPMS has the monitors off.
+
+    Fullscreen is checked on the hooks that can change it, DPMS is queried
+    every `dpms_interval` seconds over the X connection. Nothing runs while
+    no bar is watched.
+    """
+
+    def __init__(self, dpms_interval: float = 5.0) -> None:
+        self.dpms_interval = dpms_interval
+        self.blanked = False
+        self._bars: Set[Bar] = set()
+        self._update_handle = None
+        self._dpms_handle = None
+
+    def watch(self, bar: Bar) -> None:
+        if not self._bars:
+            for name in VISIBILITY_HOOKS:
+                getattr(hook.subscribe, name)(self.schedule_update)
+            if qtile.core.name == "x11":
+                self._dpms_handle = qtile.call_later(
+                    self.dpms_interval, self._poll_dpms
+                )
+        self._bars.add(bar)
+        self.schedule_update()
+
+    def forget(self, bar: Bar) -> None:
+        if bar not in self._bars:
+            return
+        self._bars.discard(bar)
+        if self._bars:
+            return
+        for name in VISIBILITY_HOOKS:
+            getattr(hook.unsubscribe, name)(self.schedule_update)
+        for handle in (self._update_handle, self._dpms_handle):
+            if handle is not None:
+                handle.cancel()
+        self._update_handle = None
+        self._dpms_handle = None
+
+    def schedule_update(self, *args) -> None:
+        # Hooks fire while windows are still being (un)managed, look at the
+        # result on the next loop iteration
+        if self._update_handle is None:
+            self._update_handle = qtile.call_soon(self.update)
+
+    def _covered(self, bar: Bar) -> bool:
+        group = bar.screen.group
+        return any(
+            window.fullscreen and not window.minimized for window in group.windows
+        )
+
+    def update(self) -> None:
+        self._update_handle = None
+        for bar in list(self._bars):
+            if bar.window is None or bar.screen is None:
+                continue
+            if self.blanked or self._covered(bar):
+                bar.suspend()
+            else:
+                bar.resume()
+
+    def _poll_dpms(self) -> None:
+        self._dpms_handle = None
+        try:
+            info = qtile.core.conn.conn(xcffib.dpms.key).Info().reply()
+        except xcffib.XcffibException:
+            logger.exception("Could not query DPMS, no longer watching it")
+            return
+        blanked = bool(info.state) and info.power_level != xcffib.dpms.DPMSMode.On
+        if blanked != self.blanked:
+            self.blanked = blanked
+            self.update()
+        self._dpms_handle = qtile.call_later(self.dpms_interval, self._poll_dpms)
+
+
+visibility = VisibilityMonitor()
@@ -0,0 +1,343 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import traceback
+from typing import Callable, Dict, List, Optional, Sequence
+
+from colors import kanagawa
+from headless import FakeQtile, configure
+
+BENCHMARKS: Dict[str, Callable[[], Optional[float]]] = {}
+
+WALLPAPER_COLORS = (
+    kanagawa.base03,
+    kanagawa.base04,
+    kanagawa.base05,
+    kanagawa.base08,
+    kanagawa.base09,
+    kanagawa.base0C,
+    kanagawa.base00,
+)
+
+
+def benchmark(func: Callable[[], Optional[float]]) -> Callable[[], Optional[float]]:
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def timed(func: Callable[[], None], number: int = 1, repeat: int = 5) -> float:
+    """Best wall time per call of `func` over `repeat` rounds, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+@benchmark
+def wallpaper_in_process() -> Optional[float]:
+    from wallpapers import render_radial_bands, write_png
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "wp.png")
+        return timed(
+            lambda: write_png(
+                render_radial_bands(1920, 1080, (2880, 0), 3075, WALLPAPER_COLORS),
+                path,
+            )
+        )
+
+
+@benchmark
+def wallpaper_subprocess() -> Optional[float]:
+    from scripts import CLICommand, CLIOptions
+
+    cwd = os.path.expanduser("~/dev/project_wallpaper")
+    if not os.path.isdir(cwd):
+        return None
+    options = CLIOptions({"center": (2880, 0), "radius": (3075,)})
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "wp.png")
+        return timed(
+            lambda: CLICommand(
+                "pipenv run python src/app.py",
+                [path, *WALLPAPER_COLORS],
+                cwd=cwd,
+                options=options,
+            ).wait(),
+            repeat=1,
+        )
+
+
+@benchmark
+def terminator_draw() -> Optional[float]:
+    from widgets import Terminator
+
+    terminator = configure(
+        Terminator(foreground=kanagawa.base02, background=kanagawa.base0C)
+    )
+    return timed(terminator.draw, number=1000)
+
+
+@benchmark
+def glyph_terminator_draw() -> Optional[float]:
+    """The Nerd Font glyph separators Terminator used to lay out with Pango."""
+    from libqtile.widget.textbox import TextBox
+
+    terminator = configure(
+        TextBox(
+            fmt="\ue0b0",
+            foreground=kanagawa.base02,
+            background=kanagawa.base0C,
+            fontsize=24,
+            padding=0,
+            font="MesloLGS NF",
+        )
+    )
+    return timed(terminator.draw, number=1000)
+
+
+def _powerline_segments():
+    from libqtile.widget.textbox import TextBox
+
+    colors = (kanagawa.base0C, kanagawa.base0D, kanagawa.base0E, kanagawa.base0F)
+    return [TextBox(text="segment", background=color) for color in colors]
+
+
+@benchmark
+def powerline_group_draw() -> Optional[float]:
+    from widgets import LeftPowerline
+
+    (group,) = LeftPowerline(*_powerline_segments()).widgets
+    configure(group)
+    return timed(group.draw, number=100)
+
+
+@benchmark
+def powerline_terminators_draw() -> Optional[float]:
+    """The previous layout, one Terminator widget per boundary."""
+    from widgets import Terminator
+
+    segments = _powerline_segments()
+    widgets = []
+    for current, next in zip(segments, segments[1:] + [None]):
+        widgets.append(current)
+        widgets.append(
+            Terminator(
+                foreground=current.background,
+                background=next.background if next else kanagawa.base00,
+            )
+        )
+    for widget in widgets:
+        configure(widget)
+
+    def draw() -> None:
+        for widget in widgets:
+            widget.draw()
+
+    return timed(draw, number=100)
+
+
+def _title_corpus(size: int = 2000) -> List[str]:
+    pages = ("Inbox", "Pull request #{}", "Issue {}", "Docs page {}", "Search {}")
+    files = ("widgets.py", "layouts.py", "src/app_{}.rs", "README.md")
+    titles = []
+    for i in range(size):
+        kind = i % 5
+        if kind == 0:
+            titles.append(f"{pages[i % len(pages)].format(i)} - Google Chrome")
+        elif kind == 1:
+            titles.append(f"{pages[i % len(pages)].format(i)} — Mozilla Firefox")
+        elif kind == 2:
+            name = files[i % len(files)].format(i)
+            titles.append(f"{name} - qtile-config - Visual Studio Code")
+        elif kind == 3:
+            titles.append(f"NVIM ~/dev/project_{i}/{files[i % len(files)].format(i)}")
+        else:
+            titles.append(f"user@host: ~/dev/project_{i} - Alacritty")
+    return titles
+
+
+@benchmark
+def title_parse_cold() -> Optional[float]:
+    """Per title, every title a cache miss."""
+    from titles import DEFAULT_RULES, TitleParser
+
+    corpus = _title_corpus()
+    return timed(lambda: list(map(TitleParser(DEFAULT_RULES), corpus))) / len(corpus)
+
+
+@benchmark
+def title_parse_warm() -> Optional[float]:
+    """Per title, titles repeating as they do across task list redraws."""
+    from titles import DEFAULT_RULES, TitleParser
+
+    corpus = _title_corpus(200)
+    parser = TitleParser(DEFAULT_RULES)
+    return timed(lambda: list(map(parser, corpus)), number=50) / len(corpus)
+
+
+@benchmark
+def powerline_build() -> Optional[float]:
+    """Building and configuring a four segment LeftPowerline."""
+    from widgets import LeftPowerline
+
+    def build() -> None:
+        (group,) = LeftPowerline(*_powerline_segments()).widgets
+        configure(group)
+
+    return timed(build, number=20)
+
+
+@benchmark
+def parse_text() -> Optional[float]:
+    """Per title, the task list's configured parser, rules file included."""
+    from widgets import _parse_text
+
+    corpus = _title_corpus(200)
+    return timed(lambda: list(map(_parse_text, corpus)), number=50) / len(corpus)
+
+
+def _layout_commands(layout, commands: List[str], windows: int = 6) -> float:
+    """Per command, sweeping right over three screens and back."""
+    from libqtile.command.base import CommandError
+
+    qtile = FakeQtile([layout], windows=windows)
+
+    def sweep() -> None:
+        for command in commands:
+            try:
+                getattr(qtile.current_screen.group.layout, command)()
+            except CommandError:
+                pass
+
+    return timed(sweep, number=10) / len(commands)
+
+
+def _sweep(left: str, right: str, steps: int = 12) -> List[str]:
+    return [right] * steps + [left] * steps
+
+
+@benchmark
+def columns_focus() -> Optional[float]:
+    from layouts import Columns
+
+    return _layout_commands(Columns(), _sweep("cmd_left", "cmd_right"))
+
+
+@benchmark
+def columns_shuffle() -> Optional[float]:
+    from layouts import Columns
+
+    return _layout_commands(Columns(), _sweep("cmd_shuffle_left", "cmd_shuffle_right"))
+
+
+@benchmark
+def columns_grow() -> Optional[float]:
+    """Per resize, growing the focused window of a 30 window group up and down."""
+    from layouts import Columns
+
+    return _layout_commands(
+        Columns(), _sweep("cmd_grow_up", "cmd_grow_down"), windows=30
+    )
+
+
+@benchmark
+def max_focus() -> Optional[float]:
+    from layouts import Max
+
+    return _layout_commands(Max(), _sweep("cmd_left", "cmd_right"))
+
+
+@benchmark
+def max_shuffle() -> Optional[float]:
+    from layouts import Max
+
+    return _layout_commands(Max(), _sweep("cmd_shuffle_left", "cmd_shuffle_right"))
+
+
+def run(names: Sequence[str]) -> Dict[str, Optional[float]]:
+    results = {}
+    for name, func in BENCHMARKS.items():
+        if names and not any(pattern in name for pattern in names):
+            continue
+        try:
+            results[name] = func()
+        except (ImportError, OSError) as e:
+            # Missing optional libraries, such as cairo on a headless box
+            print(f"{name}: {e}", file=sys.stderr)
+            results[name] = None
+        except Exception:
+            # One broken benchmark should not cost the results of the others
+            print(f"{name} failed:", file=sys.stderr)
+            traceback.print_exc()
+            results[name] = None
+    return results
+
+
+def save(results: Dict[str, Optional[float]], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump({"created": time.time(), "results": results}, f, indent=2)
+
+
+def compare(
+    results: Dict[str, Optional[float]], path: str, tolerance: float
+) -> List[str]:
+    """Print results next to the baseline's, returning the regressed ones."""
+    with open(path) as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if result is None or before is None:
+            print(f"{name:<32} {_format(result)} {_format(before)}")
+            continue
+        change = result / before - 1
+        flag = ""
+        if change > tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<32} {_format(result)} {_format(before)} {change:+8.1%}{flag}")
+    return regressions
+
+
+def _format(result: Optional[float]) -> str:
+    return "   skipped" if result is None else f"{result * 1000:10.4f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Headless benchmarks")
+    parser.add_argument("names", nargs="*", help="Only run benchmarks matching these")
+    parser.add_argument("--save", metavar="PATH", help="Write results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Compare with a baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Slowdown over the baseline flagged as a regression (default 0.2)",
+    )
+    args = parser.parse_args()
+
+    results = run(args.names)
+    if args.compare:
+        print(f"{'':<32} {'ms':>10} {'baseline':>10}")
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions:
+            print(f"Regressions: {', '.join(regressions)}")
+            sys.exit(1)
+    else:
+        print(f"{'':<32} {'ms':>10}")
+        for name, result in results.items():
+            print(f"{name:<32} {_format(result)}")
+    if args.save:
+        save(results, args.save)
+
+
+if __name__ == "__main__":
+    main()
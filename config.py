@@ -1,10 +1,27 @@
-from libqtile import hook, layout
+from config_profile import profiler
+
+profiler.time_imports(
+    "meta_config",
+    "libqtile.widget",
+    "colors",
+    "scripts",
+    "widgets",
+    "layouts",
+    "keys",
+    "screens",
+)
+
+from libqtile import hook, layout  # noqa: E402
 from libqtile.config import Match
+from libqtile.log_utils import logger
 
+from autostart import Autostart, Step
 from colors import kanagawa
 from keys import keys, mouse
-from layouts import layouts
-from screens import screens
+from layouts import layouts, screen_neighbours
+from meta_config import HOOK_RECORD
+from replay import HookRecorder
+from screens import screen_builder, screens
 from scripts import (
     configure_monitors,
     connect_bluetooth,
@@ -14,6 +31,7 @@ from scripts import (
     start_systray_menu,
     start_virtual_webcam,
 )
+from ticks import ticks
 
 keys = keys
 mouse = mouse
@@ -28,6 +46,9 @@ widget_defaults = dict(
 )
 extension_defaults = widget_defaults.copy()
 
+# Built here rather than when screens.py is imported, so the profile's
+# imports section does not count the screens section again
+screen_builder.update()
 screens = screens
 
 
@@ -59,12 +80,47 @@ wl_input_rules = None
 wmname = "qtile"
 
 
+startup_steps = Autostart(
+    [
+        Step("monitors", configure_monitors, timeout=10),
+        Step("compositor", start_compositor),
+        Step(
+            "wallpapers",
+            lambda: generate_wallpapers(screens),
+            after=("monitors",),
+            timeout=60,
+        ),
+        Step("virtual_webcam", start_virtual_webcam),
+        Step("systray_menu", start_systray_menu),
+        Step("bluetooth", connect_bluetooth),
+        Step("wifi", connect_wifi),
+    ]
+)
+
+
+startup_steps.on_finished(profiler.record_autostart)
+profiler.write()
+
+
 @hook.subscribe.startup
 def autostart(*args, **kwargs):
-    configure_monitors()
-    start_compositor()
-    generate_wallpapers(screens)
-    start_virtual_webcam()
-    start_systray_menu()
-    connect_bluetooth()
-    connect_wifi()
+    startup_steps.run()
+
+
+@hook.subscribe.shutdown
+def report_ticks():
+    logger.info(ticks.report())
+
+
+if HOOK_RECORD:
+    recorder = HookRecorder(HOOK_RECORD)
+    hook.subscribe.startup_complete(recorder.start)
+    hook.subscribe.shutdown(recorder.stop)
+
+
+# Subscribed before qtile's own screen_change handler, so the screens list
+# is up to date by the time qtile reconfigures its screens
+@hook.subscribe.screen_change
+def update_screens(event):
+    screen_builder.update()
+    screen_neighbours.invalidate()
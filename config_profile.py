@@ -0,0 +1,110 @@
+import importlib
+import json
+import os
+import subprocess
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, TypeVar
+
+from libqtile.log_utils import logger
+
+T = TypeVar("T")
+
+# Read straight from the environment: meta_config (and its .env file) is one
+# of the things being measured.
+PROFILE_ENV = "QTILE_CONFIG_PROFILE"
+REPORT_DIR = os.path.expanduser("~/.cache/qtile/profile")
+
+
+class Profiler:
+    """
+    Collect config load timings and write them as a JSON report.
+
+    Sections are `imports` (incremental import time per module, in import
+    order), `screens` and `autostart`. Everything is a no-op unless
+    QTILE_CONFIG_PROFILE is set.
+    """
+
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self.sections: Dict[str, Dict[str, float]] = {
+            "imports": {},
+            "screens": {},
+            "autostart": {},
+        }
+        self.totals: Dict[str, float] = {}
+        self._started = time.perf_counter()
+        self._path = os.path.join(REPORT_DIR, f"profile-{int(time.time())}.json")
+
+    def record(self, section: str, name: str, elapsed: float) -> None:
+        if self.enabled:
+            self.sections.setdefault(section, {})[name] = elapsed
+
+    @contextmanager
+    def span(self, section: str, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(section, name, time.perf_counter() - start)
+
+    def call(self, section: str, name: str, func: Callable[[], T]) -> T:
+        with self.span(section, name):
+            return func()
+
+    def time_imports(self, *modules: str) -> None:
+        """Import `modules` in order, recording what each one adds."""
+        if not self.enabled:
+            return
+        for module in modules:
+            with self.span("imports", module):
+                importlib.import_module(module)
+
+    def record_autostart(self, autostart: Any) -> None:
+        for name, result in autostart.results.items():
+            self.record("autostart", f"{name} ({result.status})", result.elapsed)
+        # Steps overlap, so the section total is wall time, not their sum
+        self.totals["autostart"] = autostart.elapsed
+        self.write()
+
+    def _commit(self) -> str:
+        try:
+            return subprocess.check_output(
+                ["git", "rev-parse", "HEAD"],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                stderr=subprocess.DEVNULL,
+                text=True,
+                timeout=2,
+            ).strip()
+        except (subprocess.SubprocessError, OSError):
+            return ""
+
+    def write(self) -> None:
+        if not self.enabled:
+            return
+        report = {
+            "commit": self._commit(),
+            "created": time.time(),
+            "elapsed": time.perf_counter() - self._started,
+            "totals": self.totals,
+            **self.sections,
+        }
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        with open(self._path, "w") as f:
+            json.dump(report, f, indent=2)
+        logger.info(self.summary())
+        logger.info("Config profile written to %s", self._path)
+
+    def summary(self, top: int = 5) -> str:
+        lines = ["Config profile:"]
+        for section, timings in self.sections.items():
+            if not timings:
+                continue
+            total = self.totals.get(section, sum(timings.values()))
+            slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)
+            details = ", ".join(f"{n} {t * 1000:.0f}ms" for n, t in slowest[:top])
+            lines.append(f"  {section:<10} {total * 1000:8.0f}ms  ({details})")
+        return "\n".join(lines)
+
+
+profiler = Profiler(enabled=bool(os.getenv(PROFILE_ENV)))
@@ -0,0 +1,304 @@
+"""
+Stand-ins for qtile, bars, screens, groups and windows, for running widgets
+and layouts without a display.
+"""
+
+import asyncio
+import heapq
+import itertools
+from contextlib import nullcontext
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Callable, List, Optional, Sequence
+
+from colors import kanagawa
+
+
+class HeadlessQtile:
+    core = SimpleNamespace(name="x11", masked=nullcontext)
+
+    def call_soon(self, func, *args):
+        pass
+
+    def call_later(self, delay, func, *args):
+        pass
+
+    def register_widget(self, widget):
+        pass
+
+
+class LoopQtile:
+    """qtile's scheduling methods, on the running asyncio event loop."""
+
+    core = SimpleNamespace(name="headless", masked=nullcontext)
+
+    def call_soon(self, func, *args):
+        return asyncio.get_running_loop().call_soon(func, *args)
+
+    def call_later(self, delay, func, *args):
+        return asyncio.get_running_loop().call_later(delay, func, *args)
+
+    def call_soon_threadsafe(self, func, *args):
+        return asyncio.get_running_loop().call_soon_threadsafe(func, *args)
+
+    def run_in_executor(self, func, *args):
+        return asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    def register_widget(self, widget):
+        pass
+
+
+class HeadlessWindow:
+    def create_drawer(self, width: int, height: int):
+        from libqtile.backend.base import Drawer
+
+        # The base Drawer records onto a cairo RecordingSurface and its
+        # _draw is a no-op, so nothing reaches a display
+        return Drawer(None, self, width, height)
+
+
+class HeadlessBar:
+    horizontal = True
+    background = kanagawa.base00
+
+    def __init__(self, width: int = 1920, size: int = 26, screen=None) -> None:
+        self.width = width
+        self.height = size
+        self.size = size
+        self.border_width = [0, 0, 0, 0]
+        self.window = HeadlessWindow()
+        self.screen = screen
+        self.widgets: List = []
+
+    def draw(self) -> None:
+        pass
+
+
+def configure(widget, bar: Optional[HeadlessBar] = None, qtile=None):
+    widget._configure(qtile or HeadlessQtile(), bar or HeadlessBar())
+    widget.offsetx = 0
+    widget.offsety = 0
+    widget.configured = True
+    return widget
+
+
+class FakeWindow:
+    def __init__(self, qtile: "FakeQtile", name: str, wid: int = 0) -> None:
+        self.qtile = qtile
+        self.name = name
+        self.wid = wid
+        self.x = 0
+        self.group: Optional[FakeGroup] = None
+        self.has_focus = False
+        self.urgent = False
+        self.minimized = False
+        self.maximized = False
+        self.floating = False
+        self.fullscreen = False
+        self.hidden = True
+        self.placements = 0
+
+    def place(self, *args, **kwargs) -> None:
+        self.placements += 1
+
+    def paint_borders(self, color, width: int) -> None:
+        pass
+
+    def hide(self) -> None:
+        self.hidden = True
+
+    def focus(self, warp: bool = True) -> None:
+        # X refuses input focus to unmapped windows
+        if not self.hidden:
+            self.qtile.focused_window = self
+
+    def unhide(self) -> None:
+        self.hidden = False
+
+    def cmd_toscreen(self, index: int) -> None:
+        from libqtile.command.base import CommandError
+
+        try:
+            group = self.qtile.screens[index].group
+        except IndexError:
+            raise CommandError(f"No such screen: {index}")
+        if group is self.group:
+            return
+        # As qtile's togroup
+        self.hide()
+        if self.group is not None:
+            if self.group.screen is not None:
+                self.x -= self.group.screen.x
+            self.group.remove(self)
+        if group.screen is not None and self.x < group.screen.x:
+            self.x += group.screen.x
+        group.add(self)
+
+
+class FakeGroup:
+    """The parts of a group that the custom layouts and widgets go through."""
+
+    def __init__(self, qtile: "FakeQtile", name: str, layouts: Sequence) -> None:
+        self.qtile = qtile
+        self.name = name
+        self.layouts = [layout.clone(self) for layout in layouts]
+        self.current_layout = 0
+        self.windows: List[FakeWindow] = []
+        self.current_window: Optional[FakeWindow] = None
+        self.screen: Optional[FakeScreen] = None
+        self.layout_passes = 0
+
+    @property
+    def layout(self):
+        return self.layouts[self.current_layout]
+
+    def add(self, window: FakeWindow) -> None:
+        self.windows.append(window)
+        window.group = self
+        for layout in self.layouts:
+            layout.add(window)
+        self.focus(window)
+
+    def remove(self, window: FakeWindow) -> None:
+        self.windows.remove(window)
+        window.group = None
+        had_focus = window is self.current_window
+        window.has_focus = False
+        for layout in self.layouts:
+            if layout is not self.layout:
+                layout.remove(window)
+        next_focus = self.layout.remove(window)
+        if had_focus:
+            self.current_window = None
+            self.focus(next_focus)
+        else:
+            self.layout_all()
+
+    def focus(self, window: Optional[FakeWindow], warp: bool = True) -> None:
+        # Like qtile's, focusing nothing leaves the group as it is
+        if window is None:
+            return
+        if self.current_window is not None:
+            self.current_window.has_focus = False
+        self.current_window = window
+        window.has_focus = True
+        self.layout.focus(window)
+        self.layout_all()
+
+    def layout_all(self, warp: bool = False) -> None:
+        if self.screen is None:
+            return
+        self.layout_passes += 1
+        if self.windows:
+            self.layout.layout(self.windows, self.screen.rect)
+            if self.current_window and self.screen is self.qtile.current_screen:
+                self.current_window.focus(warp)
+
+
+class FakeScreen:
+    def __init__(self, index: int, group: FakeGroup) -> None:
+        from libqtile.config import ScreenRect
+
+        self.index = index
+        self.group = group
+        self.x, self.y, self.width, self.height = index * 1920, 0, 1920, 1080
+        self.rect = ScreenRect(self.x, self.y, self.width, self.height)
+        group.screen = self
+
+    def get_rect(self):
+        return self.rect
+
+
+class FakeHandle:
+    def __init__(self) -> None:
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+
+class FakeQtile:
+    """
+    qtile with `screens` screens of `windows` windows each.
+
+    `call_soon` and `call_later` queue their callbacks on a virtual clock,
+    run by `run_until`.
+    """
+
+    core = SimpleNamespace(name="x11", masked=nullcontext)
+
+    def __init__(self, layouts: Sequence, screens: int = 3, windows: int = 6) -> None:
+        self.time = 0.0
+        self._queue: List = []
+        self._order = itertools.count()
+        self.screens = []
+        self.current_screen = None
+        # The window holding X input focus
+        self.focused_window: Optional[FakeWindow] = None
+        for index in range(screens):
+            group = FakeGroup(self, str(index), layouts)
+            self.screens.append(FakeScreen(index, group))
+            for number in range(windows):
+                group.add(FakeWindow(self, f"window {index}.{number}"))
+        self.current_screen = self.screens[0] if self.screens else None
+        if self.current_screen is not None and self.current_window is not None:
+            self.current_window.focus()
+
+    @property
+    def current_window(self) -> Optional[FakeWindow]:
+        return self.current_screen.group.current_window
+
+    @property
+    def current_group(self) -> FakeGroup:
+        return self.current_screen.group
+
+    def focus_screen(self, index: int, warp: bool = True) -> None:
+        from libqtile import hook
+
+        # As qtile's
+        if index >= len(self.screens):
+            return
+        old = self.current_screen
+        self.current_screen = self.screens[index]
+        if old is not self.current_screen:
+            hook.fire("current_screen_change")
+            hook.fire("setgroup")
+            old.group.layout_all()
+            self.current_group.focus(self.current_window, warp)
+
+    def call_later(self, delay: float, func: Callable, *args) -> FakeHandle:
+        handle = FakeHandle()
+        if func is asyncio.create_task:
+            # Widgets' _config_async, there is no event loop to run it on
+            args[0].close()
+            return handle
+        entry = (self.time + delay, next(self._order), handle, func, args)
+        heapq.heappush(self._queue, entry)
+        return handle
+
+    def call_soon(self, func: Callable, *args) -> FakeHandle:
+        return self.call_later(0, func, *args)
+
+    def call_soon_threadsafe(self, func: Callable, *args) -> FakeHandle:
+        return self.call_later(0, func, *args)
+
+    def register_widget(self, widget) -> None:
+        pass
+
+    def run_until(
+        self, time: float, measure: Optional[Callable[[Callable, float], None]] = None
+    ) -> None:
+        """Run the callbacks due by `time`, passing each one's duration to `measure`."""
+        while self._queue and self._queue[0][0] <= time:
+            due, _, handle, func, args = heapq.heappop(self._queue)
+            self.time = max(self.time, due)
+            if handle.cancelled():
+                continue
+            start = perf_counter()
+            func(*args)
+            if measure is not None:
+                measure(func, perf_counter() - start)
+        self.time = max(self.time, time)
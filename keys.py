@@ -6,7 +6,10 @@ from libqtile.lazy import lazy
 
 from colors import kanagawa
 from commands import commands
-from meta_config import CUR_DIR, TERMINAL
+from layouts import coalescer
+from meta_config import TERMINAL
+from scripts import decrease_volume, increase_volume
+from widgets import note_activity
 
 
 class Arrows(enum.Enum):
@@ -56,28 +59,29 @@ _focus_keys = [
 _move_keys = [
     # Move windows between left/right columns or move up/down in current stack.
     # Moving out of range in Columns layout will create new column.
+    # Held keys are coalesced to one layout pass per frame.
     Key(
         [Modifiers.META.value, Modifiers.CTRL.value],
         Arrows.LEFT.value,
-        lazy.layout.shuffle_left(),
+        lazy.function(coalescer.command("shuffle_left")),
         desc="Move window to the left",
     ),
     Key(
         [Modifiers.META.value, Modifiers.CTRL.value],
         Arrows.RIGHT.value,
-        lazy.layout.shuffle_right(),
+        lazy.function(coalescer.command("shuffle_right")),
         desc="Move window to the right",
     ),
     Key(
         [Modifiers.META.value, Modifiers.CTRL.value],
         Arrows.DOWN.value,
-        lazy.layout.shuffle_down(),
+        lazy.function(coalescer.command("shuffle_down")),
         desc="Move window down",
     ),
     Key(
         [Modifiers.META.value, Modifiers.CTRL.value],
         Arrows.UP.value,
-        lazy.layout.shuffle_up(),
+        lazy.function(coalescer.command("shuffle_up")),
         desc="Move window up",
     ),
     Key(
@@ -91,28 +95,29 @@ _move_keys = [
 _resize_keys = [
     # Grow windows. If current window is on the edge of screen and direction
     # will be to screen edge - window would shrink.
+    # Held keys are coalesced to one layout pass per frame.
     Key(
         [Modifiers.META.value, Modifiers.SHIFT.value],
         Arrows.LEFT.value,
-        lazy.layout.grow_left(),
+        lazy.function(coalescer.command("grow_left")),
         desc="Grow window to the left",
     ),
     Key(
         [Modifiers.META.value, Modifiers.SHIFT.value],
         Arrows.RIGHT.value,
-        lazy.layout.grow_right(),
+        lazy.function(coalescer.command("grow_right")),
         desc="Grow window to the right",
     ),
     Key(
         [Modifiers.META.value, Modifiers.SHIFT.value],
         Arrows.DOWN.value,
-        lazy.layout.grow_down(),
+        lazy.function(coalescer.command("grow_down")),
         desc="Grow window down",
     ),
     Key(
         [Modifiers.META.value, Modifiers.SHIFT.value],
         Arrows.UP.value,
-        lazy.layout.grow_up(),
+        lazy.function(coalescer.command("grow_up")),
         desc="Grow window up",
     ),
     Key(
@@ -174,19 +179,27 @@ _shortcut_keys = [
 ]
 
 
+def _raise_volume(_):
+    increase_volume()
+    note_activity()
+
+
+def _lower_volume(_):
+    decrease_volume()
+    note_activity()
+
+
 _media_keys = [
     Key(
         [],
         "XF86AudioRaiseVolume",
-        lazy.spawn("pulsemixer --change-volume +5 --max-volume 100"),
-        lazy.spawn(f"aplay '{CUR_DIR}/beep2.wav'"),
+        lazy.function(_raise_volume),
         desc="Increase volume",
     ),
     Key(
         [],
         "XF86AudioLowerVolume",
-        lazy.spawn("pulsemixer --change-volume -5 --max-volume 100"),
-        lazy.spawn(f"aplay '{CUR_DIR}/beep2.wav'"),
+        lazy.function(_lower_volume),
         desc="Decrease volume",
     ),
     Key(
@@ -1,24 +1,271 @@
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
 from libqtile import layout
 
 from colors import kanagawa
 
+DIRECTIONS = ("left", "right", "up", "down")
+
+
+def _overlap(start: int, length: int, other_start: int, other_length: int) -> int:
+    return min(start + length, other_start + other_length) - max(start, other_start)
+
+
+class ScreenNeighbours:
+    """
+    Neighbouring screen in each direction, worked out from the screens'
+    geometry rather than their order.
+
+    A screen's neighbour to the right is the closest one starting at or past
+    its right edge and sharing some of its height; likewise for the other
+    directions. Screens only touching diagonally are no one's neighbours. The table is built on first use after
+    `invalidate`, so lookups are dictionary reads.
+    """
+
+    def __init__(self) -> None:
+        self._qtile = None
+        self._table: Dict[int, Dict[str, Optional[int]]] = {}
+
+    def invalidate(self, *args) -> None:
+        self._qtile = None
+
+    def get(self, qtile, index: int, direction: str) -> Optional[int]:
+        """Index of the screen next to screen `index` in `direction`, if any."""
+        if qtile is not self._qtile:
+            self._table = self._build(qtile.screens)
+            self._qtile = qtile
+        return self._table.get(index, {}).get(direction)
+
+    def _build(self, screens) -> Dict[int, Dict[str, Optional[int]]]:
+        return {
+            screen.index: {
+                direction: self._find(screens, screen, direction)
+                for direction in DIRECTIONS
+            }
+            for screen in screens
+        }
+
+    def _find(self, screens, screen, direction: str) -> Optional[int]:
+        best = None
+        best_key = None
+        for other in screens:
+            if other is screen:
+                continue
+            if direction == "left":
+                gap = screen.x - (other.x + other.width)
+            elif direction == "right":
+                gap = other.x - (screen.x + screen.width)
+            elif direction == "up":
+                gap = screen.y - (other.y + other.height)
+            else:
+                gap = other.y - (screen.y + screen.height)
+            if gap < 0:
+                continue
+            if direction in ("left", "right"):
+                shared = _overlap(screen.y, screen.height, other.y, other.height)
+            else:
+                shared = _overlap(screen.x, screen.width, other.x, other.width)
+            if shared <= 0:
+                continue
+            # The closest, then the one sharing most of the edge
+            key = (gap, -shared)
+            if best_key is None or key < best_key:
+                best, best_key = other.index, key
+        return best
+
+
+screen_neighbours = ScreenNeighbours()
+
+
+class LayoutBatch:
+    """
+    Lay out each group at most once for a run of qtile calls.
+
+    While a batch is open, the config's layouts skip the passes qtile asks
+    for and only note them. When the outermost batch closes, every group
+    whose layout skipped one gets a single `layout_all`, from its windows
+    and screen at that point. That pass also focuses the current window,
+    which qtile could not do while the window was still hidden.
+    """
+
+    def __init__(self) -> None:
+        self._depth = 0
+        self._held: Dict = {}
+
+    def hold(self, layout) -> bool:
+        """Whether `layout` should skip the pass it was asked for."""
+        if self._depth:
+            self._held[layout] = None
+        return bool(self._depth)
+
+    @contextmanager
+    def __call__(self) -> Iterator[None]:
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                self._flush()
+
+    def _flush(self) -> None:
+        held, self._held = self._held, {}
+        for group in {layout.group: None for layout in held}:
+            group.layout_all()
+
+
+batch = LayoutBatch()
+
+
+class _CrossScreen:
+    """Focus and move windows to the screen next to the current one."""
+
+    def _neighbour(self, direction: str) -> Optional[int]:
+        qtile = self.group.qtile
+        return screen_neighbours.get(qtile, qtile.current_screen.index, direction)
+
+    def _focus_screen(self, direction: str) -> None:
+        screen_idx = self._neighbour(direction)
+        if screen_idx is not None:
+            self.group.qtile.focus_screen(screen_idx, False)
+
+    def _move_to_screen(self, client, direction: str) -> None:
+        """
+        Move `client` to the next screen and focus it there.
+
+        `toscreen` and `focus_screen` each lay out both groups, batched each
+        group is laid out once, after both.
+        """
+        screen_idx = self._neighbour(direction)
+        if screen_idx is None:
+            return
+        with batch():
+            client.cmd_toscreen(screen_idx)
+            client.qtile.focus_screen(screen_idx, False)
+
+
+class Columns(_CrossScreen, layout.Columns):
+    """
+    Columns that lays windows out from per-column geometry, worked out again
+    only for columns whose windows, sizes or position changed, and that only
+    sends geometry to windows that moved, were resized or are shown again.
+    """
+
+    def __init__(self, **config):
+        super().__init__(**config)
+        self._geometry: Dict = {}
+        self._placed: Dict = {}
+
+    def clone(self, group):
+        c = super().clone(group)
+        c._geometry = {}
+        c._placed = {}
+        return c
+
+    def _column_key(self, col, pos: int, screen_rect) -> tuple:
+        rect = (screen_rect.x, screen_rect.y, screen_rect.width, screen_rect.height)
+        clients = tuple(col.clients)
+        if col.split:
+            shown = tuple(col.heights[c] for c in clients)
+        else:
+            shown = col.cw
+        return (rect, pos, col.width, len(self.columns), col.split, clients, shown)
+
+    def _column_geometry(self, col, pos: int, screen_rect) -> Dict:
+        """Where each window of `col` goes, None for hidden ones, like
+        `configure` computes it for one window."""
+        border = self.border_width
+        margin = self.margin
+        if len(self.columns) == 1 and (len(col) == 1 or not col.split):
+            if not self.border_on_single:
+                border = 0
+            if self.margin_on_single is not None:
+                margin = self.margin_on_single
+        columns = len(self.columns)
+        width = int(0.5 + col.width * screen_rect.width * 0.01 / columns)
+        x = screen_rect.x + int(0.5 + pos * screen_rect.width * 0.01 / columns)
+
+        geometry = {}
+        if col.split:
+            offset = 0
+            for client in col:
+                height = int(
+                    0.5 + col.heights[client] * screen_rect.height * 0.01 / len(col)
+                )
+                y = screen_rect.y + int(
+                    0.5 + offset * screen_rect.height * 0.01 / len(col)
+                )
+                geometry[client] = (x, y, width, height, border, margin, True)
+                offset += col.heights[client]
+        else:
+            for client in col:
+                geometry[client] = None
+            if col.cw is not None:
+                geometry[col.cw] = (
+                    x,
+                    screen_rect.y,
+                    width,
+                    screen_rect.height,
+                    border,
+                    margin,
+                    False,
+                )
+        return geometry
+
+    def layout(self, windows, screen_rect):
+        if batch.hold(self):
+            return
+        cache = {}
+        placements = {}
+        pos = 0
+        for col in self.columns:
+            key = self._column_key(col, pos, screen_rect)
+            cached = self._geometry.get(col)
+            if cached is None or cached[0] != key:
+                cached = (key, self._column_geometry(col, pos, screen_rect))
+            cache[col] = cached
+            placements.update(cached[1])
+            pos += col.width
+        self._geometry = cache
+
+        # Windows the group did not hand over this time, floating or
+        # fullscreen ones, may have been moved and are placed again next time
+        placed, self._placed = self._placed, {}
+        for client in windows:
+            geometry = placements.get(client)
+            if geometry is None:
+                client.hide()
+                continue
+            x, y, width, height, border, margin, split = geometry
+            if client.has_focus:
+                color = self.border_focus if split else self.border_focus_stack
+            else:
+                color = self.border_normal if split else self.border_normal_stack
+
+            previous = placed.get(client)
+            if previous is None or previous[0] != geometry or client.hidden:
+                client.place(
+                    x,
+                    y,
+                    width - 2 * border,
+                    height - 2 * border,
+                    border,
+                    color,
+                    margin=margin,
+                )
+                client.unhide()
+            elif previous[1] != color:
+                client.paint_borders(color, border)
+            self._placed[client] = (geometry, color)
 
-class Columns(layout.Columns):
     def cmd_shuffle_left(self):
         cur = self.cc
         client = cur.cw
         if client is None:
             return
         if self.current <= 0 and len(cur) <= 1:
-            # Move to left screen
-            screen_idx = client.qtile.current_screen.index - 1
-            if screen_idx < 0:
-                return
-            try:
-                client.cmd_toscreen(screen_idx)
-                client.qtile.focus_screen(screen_idx, False)
-            except IndexError:
-                return
+            self._move_to_screen(client, "left")
             return
         super().cmd_shuffle_left()
 
@@ -28,13 +275,7 @@ class Columns(layout.Columns):
         if client is None:
             return
         if self.current + 1 >= len(self.columns) and len(cur) <= 1:
-            # Move to right screen
-            screen_idx = client.qtile.current_screen.index + 1
-            try:
-                client.cmd_toscreen(screen_idx)
-                client.qtile.focus_screen(screen_idx, False)
-            except IndexError:
-                return
+            self._move_to_screen(client, "right")
             return
         super().cmd_shuffle_right()
 
@@ -43,72 +284,110 @@ class Columns(layout.Columns):
             self.current = self.current - 1
             self.group.focus(self.cc.cw, True)
         else:
-            # Focus left screen
-            screen_idx = self.group.qtile.current_screen.index - 1
-            if screen_idx < 0:
-                return
-            try:
-                self.group.qtile.focus_screen(screen_idx, False)
-            except IndexError:
-                return
-            return
+            self._focus_screen("left")
 
     def cmd_right(self):
         if len(self.columns) - 1 > self.current:
             self.current = self.current + 1
             self.group.focus(self.cc.cw, True)
         else:
-            # Focus right screen
-            screen_idx = self.group.qtile.current_screen.index + 1
-            try:
-                self.group.qtile.focus_screen(screen_idx, False)
-            except IndexError:
-                return
+            self._focus_screen("right")
+
+    def cmd_up(self):
+        col = self.cc
+        if col.current_index <= 0 and not self.want_wrap(col):
+            self._focus_screen("up")
+            return
+        super().cmd_up()
+
+    def cmd_down(self):
+        col = self.cc
+        if col.current_index >= len(col) - 1 and not self.want_wrap(col):
+            self._focus_screen("down")
             return
+        super().cmd_down()
 
 
-class Max(layout.Max):
+class Max(_CrossScreen, layout.Max):
+    def layout(self, windows, screen_rect):
+        if not batch.hold(self):
+            super().layout(windows, screen_rect)
+
     def cmd_shuffle_left(self):
         client = self.group.qtile.current_window
-        # Move to left screen
-        screen_idx = self.group.qtile.current_screen.index - 1
-        if screen_idx < 0:
-            return
-        try:
-            client.cmd_toscreen(screen_idx)
-            client.qtile.focus_screen(screen_idx, False)
-        except IndexError:
-            return
-        return
+        if client is not None:
+            self._move_to_screen(client, "left")
 
     def cmd_shuffle_right(self):
         client = self.group.qtile.current_window
-        # Move to right screen
-        screen_idx = self.group.qtile.current_screen.index + 1
-        try:
-            client.cmd_toscreen(screen_idx)
-            client.qtile.focus_screen(screen_idx, False)
-        except IndexError:
-            return
-        return
+        if client is not None:
+            self._move_to_screen(client, "right")
 
     def cmd_left(self):
-        screen_idx = self.group.qtile.current_screen.index - 1
-        if screen_idx < 0:
-            return
-        try:
-            self.group.qtile.focus_screen(screen_idx, False)
-        except IndexError:
-            return
+        self._focus_screen("left")
 
     def cmd_right(self):
-        screen_idx = self.group.qtile.current_screen.index + 1
-        if screen_idx < 0:
-            return
-        try:
-            self.group.qtile.focus_screen(screen_idx, False)
-        except IndexError:
+        self._focus_screen("right")
+
+
+class KeyCoalescer:
+    """
+    Run layout commands from auto-repeating keys at most once per frame.
+
+    The first press runs its command straight away. Presses arriving within
+    `interval` of it are queued in order, repeats of the same key counted in
+    one entry, and run together when it ends, all steps in a single layout
+    pass, so holding a resize key costs one layout pass per frame however
+    fast the keyboard repeats.
+    """
+
+    def __init__(self, interval: float = 1 / 60) -> None:
+        self.interval = interval
+        self._pending: List[List] = []
+        self._handle = None
+
+    def command(self, name: str) -> Callable:
+        """Function for `lazy.function` running layout command `name`."""
+
+        def press(qtile) -> None:
+            self._press(qtile, name)
+
+        press.__name__ = name
+        return press
+
+    def _press(self, qtile, name: str) -> None:
+        if self._handle is not None:
+            # Only consecutive repeats merge, so steps keep the order they
+            # were pressed in
+            if self._pending and self._pending[-1][0] == name:
+                self._pending[-1][1] += 1
+            else:
+                self._pending.append([name, 1])
             return
+        self._run(qtile, name, 1)
+        self._handle = qtile.call_later(self.interval, self._flush, qtile)
+
+    def _flush(self, qtile) -> None:
+        self._handle = None
+        pending, self._pending = self._pending, []
+        with batch():
+            for name, count in pending:
+                self._run(qtile, name, count)
+        if pending:
+            # Keys are still repeating, keep to one run per frame
+            self._handle = qtile.call_later(self.interval, self._flush, qtile)
+
+    def _run(self, qtile, name: str, count: int) -> None:
+        with batch():
+            for _ in range(count):
+                # Looked up on every step, shuffling can change screens
+                command = getattr(qtile.current_group.layout, f"cmd_{name}", None)
+                if command is None:
+                    return
+                command()
+
+
+coalescer = KeyCoalescer()
 
 
 BORDER_WIDTH = 2
@@ -8,5 +8,12 @@ BLUETOOTH_DEVICE = os.getenv("BLUETOOTH_DEVICE", "")
 TERMINAL = os.getenv("TERMINAL", "")
 WIFI_SSID = os.getenv("WIFI_SSID", "")
 WIFI_PASSWORD = os.getenv("WIFI_PASSWORD", "")
+VOLUME_BEEP = os.getenv("VOLUME_BEEP", "1") != "0"
+TITLE_RULES = os.getenv(
+    "TITLE_RULES", os.path.expanduser("~/.config/qtile/title_rules.json")
+)
+
+# Hook events are written here when set, see replay.py
+HOOK_RECORD = os.getenv("HOOK_RECORD", "")
 
 CUR_DIR = os.path.realpath(os.path.dirname(__file__))
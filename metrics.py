@@ -0,0 +1,73 @@
+import time
+from collections import deque
+from typing import Callable, Deque, List
+
+import psutil
+from libqtile.log_utils import logger
+
+from ticks import ticks
+
+
+class MetricsSampler:
+    """
+    Read CPU, memory and network counters once per tick into ring buffers.
+
+    Widgets subscribe instead of running their own timers, so a text widget
+    and its graph share a single reading and redraw on the same tick. The
+    timer runs on the shared tick scheduler, and only while something is
+    subscribed.
+    """
+
+    def __init__(self, interval: float = 1.0, samples: int = 100) -> None:
+        self.interval = interval
+        self.cpu: Deque[float] = deque(maxlen=samples)
+        self.memory: Deque = deque(maxlen=samples)
+        self.net_down: Deque[float] = deque(maxlen=samples)
+        self.net_up: Deque[float] = deque(maxlen=samples)
+        self._net_counters = psutil.net_io_counters()
+        self._net_time = time.monotonic()
+        self._subscribers: List[Callable[[], None]] = []
+        self._handle = None
+        # The first cpu_percent call only primes psutil's counters
+        psutil.cpu_percent()
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        self._subscribers.append(callback)
+        if self._handle is None:
+            self._tick()
+
+    def unsubscribe(self, callback: Callable[[], None]) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+        if not self._subscribers and self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def sample(self) -> None:
+        self.cpu.append(psutil.cpu_percent())
+        self.memory.append(psutil.virtual_memory())
+
+        counters = psutil.net_io_counters()
+        now = time.monotonic()
+        elapsed = (now - self._net_time) or self.interval
+        self.net_down.append(
+            (counters.bytes_recv - self._net_counters.bytes_recv) / elapsed
+        )
+        self.net_up.append(
+            (counters.bytes_sent - self._net_counters.bytes_sent) / elapsed
+        )
+        self._net_counters = counters
+        self._net_time = now
+
+        for callback in list(self._subscribers):
+            try:
+                callback()
+            except Exception:
+                logger.exception("Metrics subscriber failed")
+
+    def _tick(self) -> None:
+        self.sample()
+        self._handle = ticks.call_aligned(self.interval, self._tick)
+
+
+sampler = MetricsSampler()
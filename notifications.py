@@ -0,0 +1,140 @@
+import asyncio
+from typing import Any, Dict, Optional, Set
+
+from dbus_next import Message, MessageType, Variant
+from dbus_next.aio import MessageBus
+from libqtile import qtile
+from libqtile.log_utils import logger
+
+URGENCY_LOW = 0
+URGENCY_NORMAL = 1
+URGENCY_CRITICAL = 2
+
+
+class Notifier:
+    """
+    Client for org.freedesktop.Notifications that owns a single bubble.
+
+    The bus connection is kept open between calls, every update replaces the
+    previous bubble in place and bursts within `debounce` seconds collapse
+    into the last one. Sends are serialised, so each one replaces the bubble
+    the previous one created. `notify` is safe to call from any thread.
+    """
+
+    def __init__(
+        self,
+        app_name: str = "qtile",
+        debounce: float = 0.05,
+        timeout: int = -1,
+        bus_address: Optional[str] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        self.app_name = app_name
+        self.debounce = debounce
+        self.timeout = timeout
+        self.bus_address = bus_address
+        self.loop = loop
+        self.notification_id = 0
+        self._bus: Optional[MessageBus] = None
+        self._pending: Optional[tuple] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._send_lock: Optional[asyncio.Lock] = None
+
+    def notify(
+        self,
+        summary: str,
+        body: str = "",
+        value: Optional[int] = None,
+        urgency: int = URGENCY_NORMAL,
+    ) -> None:
+        hints: Dict[str, Variant] = {"urgency": Variant("y", urgency)}
+        if value is not None:
+            hints["value"] = Variant("i", value)
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._schedule, summary, body, hints)
+        else:
+            qtile.call_soon_threadsafe(self._schedule, summary, body, hints)
+
+    def _schedule(self, summary: str, body: str, hints: Dict[str, Variant]) -> None:
+        self._pending = (summary, body, hints)
+        if self._handle is None:
+            self._handle = asyncio.get_running_loop().call_later(
+                self.debounce, self._flush
+            )
+
+    def _flush(self) -> None:
+        self._handle = None
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            task = asyncio.create_task(self._send(*pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._on_sent)
+
+    def _on_sent(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Failed to send notification", exc_info=task.exception())
+
+    async def _connect(self) -> Optional[MessageBus]:
+        if self._bus is None or not self._bus.connected:
+            try:
+                self._bus = await MessageBus(bus_address=self.bus_address).connect()
+            except Exception:
+                logger.warning("Unable to connect to dbus.")
+                self._bus = None
+        return self._bus
+
+    async def _send(self, summary: str, body: str, hints: Dict[str, Any]) -> None:
+        if self._send_lock is None:
+            self._send_lock = asyncio.Lock()
+        # Without waiting for the previous reply, two sends made before the
+        # bubble exists would both ask for a new one
+        async with self._send_lock:
+            await self._send_locked(summary, body, hints)
+
+    async def _send_locked(
+        self, summary: str, body: str, hints: Dict[str, Any]
+    ) -> None:
+        bus = await self._connect()
+        if bus is None:
+            return
+        message = Message(
+            destination="org.freedesktop.Notifications",
+            interface="org.freedesktop.Notifications",
+            path="/org/freedesktop/Notifications",
+            member="Notify",
+            signature="susssasa{sv}i",
+            body=[
+                self.app_name,
+                self.notification_id,
+                "",
+                summary,
+                body,
+                [],
+                hints,
+                self.timeout,
+            ],
+        )
+        try:
+            msg = await bus.call(message)
+        except Exception:
+            logger.exception("Unable to send notification")
+            return
+        if msg.message_type == MessageType.ERROR:
+            logger.warning(
+                "Unable to send notification. Is a notification server running?"
+            )
+            return
+        self.notification_id = msg.body[0]
+
+    def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._bus is not None:
+            self._bus.disconnect()
+            self._bus = None
@@ -0,0 +1,118 @@
+"""Connected outputs and the screens built for them."""
+
+import re
+import subprocess
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from libqtile import qtile
+from libqtile.config import Screen
+from libqtile.log_utils import logger
+
+from config_profile import profiler
+
+
+class Output(NamedTuple):
+    name: str
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+XRANDR_OUTPUT = re.compile(
+    r"^(\S+) connected (?:primary )?(\d+)x(\d+)\+(\d+)\+(\d+)", re.MULTILINE
+)
+
+
+def connected_outputs() -> List[Output]:
+    """
+    Connected and enabled outputs, as `xrandr --current` lists them.
+
+    --current reports what the X server already knows instead of making
+    RandR probe every output again, which can take hundreds of milliseconds
+    and runs on the event loop on every hotplug.
+    """
+    try:
+        result = subprocess.run(
+            ["xrandr", "--current"],
+            capture_output=True,
+            text=True,
+            timeout=2,
+            check=True,
+        )
+    except (subprocess.SubprocessError, OSError):
+        logger.exception("Could not list outputs")
+        return []
+    return [
+        Output(name, int(x), int(y), int(width), int(height))
+        for name, width, height, x, y in XRANDR_OUTPUT.findall(result.stdout)
+    ]
+
+
+class ScreenBuilder:
+    """
+    Build screens only for the outputs that are connected.
+
+    Outputs are matched to builders by name; an output without a builder of
+    its own gets `fallback`'s, when that output is not connected itself.
+    A screen is built when its output shows up and dropped when it goes
+    away, and `screens` is updated in place: qtile holds the same list and
+    lays it over its outputs, in its own order, on the next reconfiguration.
+    """
+
+    def __init__(self, builders: Dict[str, Callable[[], Screen]], fallback: str):
+        self.builders = builders
+        self.fallback = fallback
+        self.screens: List[Screen] = []
+        self._built: Dict[str, Screen] = {}
+
+    def _assign(self, outputs: List[Output]) -> List[Optional[str]]:
+        names = [output.name for output in outputs]
+        keys: List[Optional[str]] = []
+        for name in names:
+            if name in self.builders:
+                keys.append(name)
+            elif self.fallback not in names and self.fallback not in keys:
+                keys.append(self.fallback)
+            else:
+                keys.append(None)
+        return keys
+
+    def _order(self, outputs: List[Output]) -> List[Output]:
+        # qtile merges outputs sharing a position and takes screens in the
+        # order its backend reports them
+        by_position: Dict[Tuple[int, int], Output] = {}
+        for output in outputs:
+            by_position.setdefault((output.x, output.y), output)
+        if qtile is None:
+            return list(by_position.values())
+        ordered = [
+            by_position.pop((x, y))
+            for x, y, _, _ in qtile.core.get_screen_info()
+            if (x, y) in by_position
+        ]
+        return ordered + list(by_position.values())
+
+    def update(self) -> None:
+        outputs = self._order(connected_outputs())
+        # Without xrandr, set up the main screen and let qtile fill the rest
+        keys = self._assign(outputs) if outputs else [self.fallback]
+
+        built = {}
+        screens = []
+        for key in keys:
+            if key is None:
+                screens.append(Screen())
+                continue
+            if key not in self._built:
+                logger.info("Building screen for %s", key)
+                builder = self.builders[key]
+                self._built[key] = profiler.call(
+                    "screens", builder.__name__.lstrip("_"), builder
+                )
+            built[key] = self._built[key]
+            screens.append(built[key])
+
+        # Bars of dropped screens are finalized by qtile, they can't be reused
+        self._built = built
+        self.screens[:] = screens
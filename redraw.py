@@ -0,0 +1,55 @@
+from typing import Dict
+
+from libqtile import qtile
+from libqtile.widget.base import _Widget
+
+
+class RedrawScheduler:
+    """
+    Collect widget redraw requests made during one event loop iteration and
+    run them together on the next one.
+
+    A widget whose length is the same as at its last redraw is drawn on its
+    own. Otherwise its whole bar is drawn, once per bar however many of its
+    widgets asked. Widgets on suspended bars are skipped.
+    """
+
+    def __init__(self) -> None:
+        self._dirty: Dict[_Widget, None] = {}
+        self._lengths: Dict[_Widget, int] = {}
+        self._handle = None
+
+    def mark(self, widget: _Widget) -> None:
+        self._dirty[widget] = None
+        if self._handle is None:
+            self._handle = qtile.call_soon(self.flush)
+
+    def forget(self, widget: _Widget) -> None:
+        self._dirty.pop(widget, None)
+        self._lengths.pop(widget, None)
+
+    def flush(self) -> None:
+        self._handle = None
+        dirty, self._dirty = self._dirty, {}
+
+        bars: Dict = {}
+        widgets = []
+        for widget in dirty:
+            # Suspended bars redraw everything when they resume
+            if getattr(widget.bar, "suspended", False):
+                continue
+            length = widget.length
+            if self._lengths.get(widget) != length:
+                self._lengths[widget] = length
+                bars[widget.bar] = None
+            else:
+                widgets.append(widget)
+
+        for bar in bars:
+            bar.draw()
+        for widget in widgets:
+            if widget.bar not in bars:
+                widget.draw()
+
+
+redraws = RedrawScheduler()
@@ -0,0 +1,304 @@
+"""
+Record hook events from a live session and replay them against headless
+copies of the bar widgets and layouts, timing every handler.
+
+Recording is enabled by pointing HOOK_RECORD at a file. Replay with
+
+    python replay.py LOG [--realtime] [--speed N]
+"""
+
+import argparse
+import json
+import time
+from collections import defaultdict
+from typing import IO, Any, Callable, Dict, List, Optional
+
+from libqtile import hook
+from libqtile.log_utils import logger
+
+RECORDED_HOOKS = (
+    "client_focus",
+    "client_killed",
+    "client_managed",
+    "client_name_updated",
+    "current_screen_change",
+    "focus_change",
+    "layout_change",
+    "setgroup",
+)
+
+
+def _wid(window) -> Optional[int]:
+    return window.wid if window is not None else None
+
+
+class HookRecorder:
+    """
+    Write hook events as JSON lines: a snapshot of the screens first, then
+    one `[seconds, hook, payload]` line per event, with just what replaying
+    it needs.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file: Optional[IO[str]] = None
+        self._started = 0.0
+        self._handlers: Dict[str, Callable] = {}
+        self._unflushed = 0
+
+    def start(self) -> None:
+        from libqtile import qtile
+
+        self.qtile = qtile
+        self._file = open(self.path, "w")
+        self._started = time.monotonic()
+        self._write(
+            {
+                "current_screen": qtile.current_screen.index,
+                "screens": [
+                    {
+                        "group": screen.group.name,
+                        "layout": screen.group.layout.name,
+                        "windows": [[w.wid, w.name] for w in screen.group.windows],
+                    }
+                    for screen in qtile.screens
+                ],
+            }
+        )
+        for name in RECORDED_HOOKS:
+            self._handlers[name] = self._recorder(name)
+            getattr(hook.subscribe, name)(self._handlers[name])
+        logger.info("Recording hook events to %s", self.path)
+
+    def stop(self) -> None:
+        for name, handler in self._handlers.items():
+            getattr(hook.unsubscribe, name)(handler)
+        self._handlers = {}
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, entry: Any) -> None:
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._unflushed += 1
+        if self._unflushed >= 50:
+            self._file.flush()
+            self._unflushed = 0
+
+    def _recorder(self, name: str) -> Callable:
+        def record(*args):
+            elapsed = round(time.monotonic() - self._started, 4)
+            self._write([elapsed, name, self._payload(name, args)])
+
+        return record
+
+    def _payload(self, name: str, args: tuple) -> Dict[str, Any]:
+        screen = self.qtile.current_screen
+        if name in ("current_screen_change", "focus_change", "setgroup"):
+            return {
+                "screen": screen.index,
+                "group": screen.group.name,
+                "window": _wid(screen.group.current_window),
+            }
+        if name == "layout_change":
+            layout, group = args
+            return {"group": group.name, "layout": layout.name}
+        window = args[0]
+        payload = {"window": window.wid}
+        if name in ("client_managed", "client_name_updated"):
+            payload["name"] = window.name
+        if name == "client_managed" and window.group is not None:
+            payload["group"] = window.group.name
+        return payload
+
+
+def _handler_name(func: Callable) -> str:
+    owner = getattr(func, "__self__", None)
+    if owner is not None:
+        return f"{type(owner).__name__}.{func.__name__}"
+    return getattr(func, "__qualname__", repr(func))
+
+
+class Replayer:
+    """
+    Build the config's bar widgets and layouts on a headless qtile shaped
+    like the recorded snapshot, then apply each event to it and call the
+    hook's subscribers.
+
+    Time spent in layouts applying an event, in hook handlers and in the
+    callbacks they defer (redraws, throttled refreshes) is recorded per
+    handler. Deferred callbacks run on a virtual clock that follows the
+    log's timestamps.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path) as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        self.snapshot = lines[0]
+        self.events = lines[1:]
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+
+    def build(self) -> None:
+        import libqtile
+
+        from headless import FakeGroup, FakeQtile, FakeScreen, FakeWindow
+
+        # Modules bind libqtile.qtile when imported, so it has to be in place
+        # before the widgets are
+        self.qtile = qtile = FakeQtile([], screens=0)
+        libqtile.qtile = qtile
+
+        from layouts import layouts
+
+        self.groups: Dict[str, FakeGroup] = {}
+        self.windows: Dict[int, FakeWindow] = {}
+        self._new_group = lambda name: FakeGroup(qtile, name, layouts)
+        self._new_window = lambda wid, name: FakeWindow(qtile, name, wid)
+        for index, entry in enumerate(self.snapshot["screens"]):
+            group = self._group(entry["group"])
+            self._set_layout(group, entry["layout"])
+            qtile.screens.append(FakeScreen(index, group))
+            for wid, name in entry["windows"]:
+                self.windows[wid] = self._new_window(wid, name)
+                group.add(self.windows[wid])
+        qtile.current_screen = qtile.screens[self.snapshot["current_screen"]]
+        self._build_widgets()
+
+    def _build_widgets(self) -> None:
+        from colors import kanagawa
+        from headless import HeadlessBar, configure
+        from widgets import (
+            CurrentLayout,
+            CurrentScreen,
+            DynamicTerminator,
+            shared_task_list,
+        )
+
+        for screen in self.qtile.screens:
+            bar = HeadlessBar(screen=screen)
+            bar.widgets = [
+                CurrentScreen(),
+                DynamicTerminator(
+                    active_foreground=kanagawa.base0C, foreground=kanagawa.base0D
+                ),
+                CurrentLayout(),
+                shared_task_list(),
+            ]
+            for widget in bar.widgets:
+                configure(widget, bar, self.qtile)
+        self.qtile.run_until(0.0)
+
+    def _group(self, name: str):
+        if name not in self.groups:
+            self.groups[name] = self._new_group(name)
+        return self.groups[name]
+
+    def _set_layout(self, group, name: str) -> None:
+        for index, layout in enumerate(group.layouts):
+            if layout.name == name:
+                group.current_layout = index
+
+    def _timed(self, name: str, func: Callable, *args) -> None:
+        start = time.perf_counter()
+        func(*args)
+        self.timings[name].append(time.perf_counter() - start)
+
+    def _apply(self, name: str, payload: Dict[str, Any]) -> Optional[tuple]:
+        """Bring the headless qtile to the recorded state, returning the hook's
+        arguments, or None when the event refers to something unknown."""
+        qtile = self.qtile
+        if name in ("current_screen_change", "focus_change", "setgroup"):
+            screen = qtile.screens[payload["screen"]]
+            qtile.current_screen = screen
+            group = self._group(payload["group"])
+            if group is not screen.group:
+                screen.group.screen = None
+                screen.group = group
+                group.screen = screen
+            group.current_window = self.windows.get(payload["window"])
+            return ()
+        if name == "layout_change":
+            group = self._group(payload["group"])
+            self._set_layout(group, payload["layout"])
+            self._timed(
+                f"{group.layout.__class__.__name__}.layout_all", group.layout_all
+            )
+            return (group.layout, group)
+        if name == "client_managed":
+            window = self._new_window(payload["window"], payload["name"])
+            self.windows[window.wid] = window
+            group = self._group(payload.get("group", qtile.current_group.name))
+            self._timed(f"{group.layout.__class__.__name__}.add", group.add, window)
+            return (window,)
+
+        window = self.windows.get(payload["window"])
+        if window is None:
+            return None
+        if name == "client_killed":
+            del self.windows[window.wid]
+            if window.group is not None:
+                group = window.group
+                self._timed(
+                    f"{group.layout.__class__.__name__}.remove", group.remove, window
+                )
+        elif name == "client_name_updated":
+            window.name = payload["name"]
+        elif name == "client_focus" and window.group is not None:
+            group = window.group
+            self._timed(f"{group.layout.__class__.__name__}.focus", group.focus, window)
+        return (window,)
+
+    def _measure(self, func: Callable, elapsed: float) -> None:
+        self.timings[f"{_handler_name(func)} (deferred)"].append(elapsed)
+
+    def run(self, realtime: bool = False, speed: float = 1.0) -> float:
+        started = time.perf_counter()
+        for at, name, payload in self.events:
+            self.qtile.run_until(at, self._measure)
+            if realtime:
+                time.sleep(max(0.0, at / speed - (time.perf_counter() - started)))
+            args = self._apply(name, payload)
+            if args is None:
+                continue
+            for handler in list(hook.subscriptions.get(name, [])):
+                self._timed(_handler_name(handler), handler, *args)
+        self.qtile.run_until(float("inf"), self._measure)
+        return time.perf_counter() - started
+
+    def report(self) -> str:
+        lines = [
+            f"{'handler':<44} {'calls':>6} {'mean us':>9} {'p95 us':>9} "
+            f"{'max us':>9} {'total ms':>9}"
+        ]
+        rows = sorted(self.timings.items(), key=lambda item: -sum(item[1]))
+        for name, samples in rows:
+            ordered = sorted(samples)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            lines.append(
+                f"{name:<44} {len(samples):>6} "
+                f"{sum(samples) / len(samples) * 1e6:>9.1f} {p95 * 1e6:>9.1f} "
+                f"{ordered[-1] * 1e6:>9.1f} {sum(samples) * 1e3:>9.2f}"
+            )
+        return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a recorded hook log")
+    parser.add_argument("log", help="File written with HOOK_RECORD set")
+    parser.add_argument(
+        "--realtime", action="store_true", help="Keep the recorded pacing"
+    )
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="Pacing multiplier with --realtime"
+    )
+    args = parser.parse_args()
+
+    replayer = Replayer(args.log)
+    replayer.build()
+    elapsed = replayer.run(realtime=args.realtime, speed=args.speed)
+    print(f"Replayed {len(replayer.events)} events in {elapsed:.3f}s")
+    print(replayer.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -2,36 +2,54 @@ from libqtile import bar, widget
 from libqtile.config import Screen
 from libqtile.lazy import lazy
 
+from bars import Bar
 from colors import kanagawa
 from commands import open_calendar
 from meta_config import BLUETOOTH_DEVICE, TERMINAL
-from widgets import CurrentLayout, CurrentScreen, DynamicTerminator
+from outputs import ScreenBuilder
+from widgets import (
+    CPU,
+    Clock,
+    CPUGraph,
+    CurrentLayout,
+    CurrentScreen,
+    DynamicTerminator,
+)
 from widgets import GenericVolume as Volume
-from widgets import LeftPowerline, RightPowerline, shared_task_list
+from widgets import (
+    LeftPowerline,
+    Memory,
+    MemoryGraph,
+    Net,
+    NetGraph,
+    RightPowerline,
+    ThermalSensor,
+    shared_task_list,
+)
 
 
 def _main_screen():
     top_bar_size = 26
     bottom_bar_size = 26
     return Screen(
-        top=bar.Bar(
+        top=Bar(
             size=top_bar_size,
             widgets=[
                 *LeftPowerline(
-                    widget.ThermalSensor(
+                    ThermalSensor(
                         fmt=" {}",
                         background=kanagawa.base0C,
                         foreground=kanagawa.base00,
                     ),
                     (
-                        widget.CPU(
+                        CPU(
                             format=" {load_percent:.1f}%",
                             background=kanagawa.base02,
                             mouse_callbacks={
                                 "Button1": lazy.spawn(TERMINAL + " -e bashtop")
                             },
                         ),
-                        widget.CPUGraph(
+                        CPUGraph(
                             type="line",
                             border_width=1,
                             line_width=1,
@@ -44,14 +62,14 @@ def _main_screen():
                         ),
                     ),
                     (
-                        widget.Memory(
+                        Memory(
                             format=" {MemPercent:.1f}%",
                             background=kanagawa.base01,
                             mouse_callbacks={
                                 "Button1": lazy.spawn(TERMINAL + " -e bashtop")
                             },
                         ),
-                        widget.MemoryGraph(
+                        MemoryGraph(
                             type="line",
                             border_width=1,
                             line_width=1,
@@ -64,11 +82,11 @@ def _main_screen():
                         ),
                     ),
                     (
-                        widget.Net(
+                        Net(
                             format=" {down} \u2193\u2191 {up}",
                             background=kanagawa.base02,
                         ),
-                        widget.NetGraph(
+                        NetGraph(
                             type="line",
                             border_width=1,
                             line_width=1,
@@ -111,7 +129,7 @@ def _main_screen():
             border_width=0,
             background=kanagawa.base00,
         ),
-        bottom=bar.Bar(
+        bottom=Bar(
             [
                 CurrentScreen(
                     fmt=" {}",
@@ -125,15 +143,11 @@ def _main_screen():
                     foreground=kanagawa.base00,
                 ),
                 DynamicTerminator(
-                    fmt="",
+                    direction="right",
                     active_foreground=kanagawa.base0B,
                     foreground=kanagawa.base0C,
                     background=kanagawa.base0D,
-                    fontsize=26,
-                    padding=0,
-                    markup=False,
-                    hack_offset=0,
-                    font="MesloLGS NF",
+                    size=bottom_bar_size - 2,
                 ),
                 *LeftPowerline(
                     CurrentLayout(
@@ -151,7 +165,7 @@ def _main_screen():
                         background=kanagawa.base02,
                         max_width=20,
                     ),
-                    widget.Clock(
+                    Clock(
                         format="%d/%m/%Y %H:%M ",
                         background=kanagawa.base0D,
                         foreground=kanagawa.base00,
@@ -167,7 +181,7 @@ def _main_screen():
 def _secondary_screen_left():
     bottom_bar_size = 26
     return Screen(
-        bottom=bar.Bar(
+        bottom=Bar(
             [
                 CurrentScreen(
                     fmt=" {}",
@@ -181,15 +195,11 @@ def _secondary_screen_left():
                     foreground=kanagawa.base00,
                 ),
                 DynamicTerminator(
-                    fmt="",
+                    direction="right",
                     active_foreground=kanagawa.base0B,
                     foreground=kanagawa.base0C,
                     background=kanagawa.base0D,
-                    fontsize=26,
-                    padding=0,
-                    markup=False,
-                    hack_offset=0,
-                    font="MesloLGS NF",
+                    size=bottom_bar_size - 2,
                 ),
                 *LeftPowerline(
                     CurrentLayout(
@@ -212,7 +222,7 @@ def _secondary_screen_left():
 def _secondary_screen_right():
     bottom_bar_size = 26
     return Screen(
-        bottom=bar.Bar(
+        bottom=Bar(
             [
                 CurrentScreen(
                     fmt=" {}",
@@ -226,15 +236,11 @@ def _secondary_screen_right():
                     foreground=kanagawa.base00,
                 ),
                 DynamicTerminator(
-                    fmt="",
+                    direction="right",
                     active_foreground=kanagawa.base0B,
                     foreground=kanagawa.base0C,
                     background=kanagawa.base0D,
-                    fontsize=26,
-                    padding=0,
-                    markup=False,
-                    hack_offset=0,
-                    font="MesloLGS NF",
+                    size=bottom_bar_size - 2,
                 ),
                 *LeftPowerline(
                     CurrentLayout(
@@ -255,8 +261,13 @@ def _secondary_screen_right():
     )
 
 
-screens = [
-    _secondary_screen_left(),
-    _main_screen(),
-    _secondary_screen_right(),
-]
+screen_builder = ScreenBuilder(
+    {
+        "DisplayPort-0": _secondary_screen_left,
+        "HDMI-A-0": _main_screen,
+        "DVI-D-0": _secondary_screen_right,
+    },
+    fallback="HDMI-A-0",
+)
+# Filled by screen_builder.update(), called from config.py
+screens = screen_builder.screens
@@ -1,11 +1,28 @@
+import contextlib
 import os
 import subprocess
 from typing import Any, Dict, Optional, Sequence, Tuple
 
+from libqtile import qtile
 from libqtile.config import Screen
+from libqtile.log_utils import logger
 
 from colors import kanagawa
-from meta_config import BLUETOOTH_DEVICE, CUR_DIR, WIFI_PASSWORD, WIFI_SSID
+from meta_config import (
+    BLUETOOTH_DEVICE,
+    CUR_DIR,
+    VOLUME_BEEP,
+    WIFI_PASSWORD,
+    WIFI_SSID,
+)
+from sounds import Beep
+from volume import VolumeController
+from wallpapers import (
+    RENDERER_VERSION,
+    WallpaperCache,
+    render_radial_bands,
+    write_png,
+)
 
 
 class CLIValues(tuple):
@@ -46,10 +63,10 @@ class CLICommands:
             command.wait()
 
 
-def generate_wallpapers(screens: Sequence[Screen]):
-    base_command = "pipenv run python src/app.py"
-    cwd = os.path.expanduser("~/dev/project_wallpaper")
+wallpaper_cache = WallpaperCache()
+
 
+def generate_wallpapers(screens: Sequence[Screen]):
     colors = (
         kanagawa.base03,
         kanagawa.base04,
@@ -59,43 +76,53 @@ def generate_wallpapers(screens: Sequence[Screen]):
         kanagawa.base0C,
         kanagawa.base00,
     )
-    radius = int(((1920 * 1.5) ** 2 + (1080) ** 2) ** 0.5)
-    wp_configs = {
-        1: CLIOptions(
-            {
-                "center": (int(1920 * 1.5), 0),
-                "radius": (radius,),
-            }
-        ),
-        2: CLIOptions(
-            {
-                "center": (int(1920 / 2), 0),
-                "radius": (radius,),
-            }
-        ),
-        3: CLIOptions(
-            {
-                "center": (int(-1920 / 2), 0),
-                "radius": (radius,),
-            }
-        ),
-    }
-
-    commands = CLICommands(
-        [
-            CLICommand(
-                base_command,
-                [f"{CUR_DIR}/wallpapers/wp{index}.png", *colors],
-                cwd=cwd,
-                options=options,
+    # Screens without an output are never configured and have no geometry
+    screens = [screen for screen in screens if screen.width]
+    if not screens:
+        # Headless, or in the middle of a screen reconfiguration
+        logger.info("No configured screens, not generating wallpapers")
+        return
+    # Bands radiate from the top middle of the whole desktop, out to its
+    # farthest corner, so they line up across monitors.
+    left = min(screen.x for screen in screens)
+    top = min(screen.y for screen in screens)
+    right = max(screen.x + screen.width for screen in screens)
+    bottom = max(screen.y + screen.height for screen in screens)
+    center = ((left + right) / 2, top)
+    radius = int((((right - left) / 2) ** 2 + (bottom - top) ** 2) ** 0.5)
+
+    rendered = False
+    for screen in screens:
+        local_center = (center[0] - screen.x, center[1] - screen.y)
+        key = wallpaper_cache.key(
+            colors=colors,
+            center=local_center,
+            radius=radius,
+            resolution=(screen.width, screen.height),
+            version=RENDERER_VERSION,
+        )
+        path = wallpaper_cache.get(key)
+        if path is None:
+            # Only cache misses are rendered
+            path = wallpaper_cache.path(key)
+            os.makedirs(wallpaper_cache.directory, exist_ok=True)
+            pixels = render_radial_bands(
+                screen.width, screen.height, local_center, radius, colors
             )
-            for index, options in wp_configs.items()
-        ]
-    )
-    commands.wait()
-
-    for index, screen in enumerate(screens, start=1):
-        screen.cmd_set_wallpaper(f"{CUR_DIR}/wallpapers/wp{index}.png", mode="fill")
+            part = f"{path}.part"
+            try:
+                write_png(pixels, part)
+                os.replace(part, path)
+            finally:
+                # Only left there when writing or renaming failed
+                with contextlib.suppress(OSError):
+                    os.remove(part)
+            rendered = True
+        # Runs on an autostart worker, wallpapers are set from the event loop
+        qtile.call_soon_threadsafe(screen.cmd_set_wallpaper, path, "fill")
+
+    if rendered:
+        wallpaper_cache.prune()
 
 
 def configure_monitors():
@@ -109,7 +136,7 @@ def configure_monitors():
     CLICommand(
         cmd,
         cwd=cwd,
-    )
+    ).wait()
 
 
 def start_compositor():
@@ -143,34 +170,18 @@ def toggle_audio_profile():
     )
 
 
+volume_controller = VolumeController(max_volume=100)
+beep = Beep(f"{CUR_DIR}/beep2.wav", enabled=VOLUME_BEEP)
+
+
 def increase_volume():
-    CLICommands(
-        [
-            CLICommand(
-                "pulsemixer",
-                args=["--change-volume", "+5", "--max-volume", "100"],
-            ),
-            CLICommand(
-                "aplay",
-                args=[f"{CUR_DIR}/beep2.wav"],
-            ),
-        ]
-    )
+    volume_controller.change(+5)
+    beep.play()
 
 
 def decrease_volume():
-    CLICommands(
-        [
-            CLICommand(
-                "pulsemixer",
-                args=["--change-volume", "-5", "--max-volume", "100"],
-            ),
-            CLICommand(
-                "aplay",
-                args=[f"{CUR_DIR}/beep2.wav"],
-            ),
-        ]
-    )
+    volume_controller.change(-5)
+    beep.play()
 
 
 def connect_bluetooth():
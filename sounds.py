@@ -0,0 +1,150 @@
+import queue
+import subprocess
+import threading
+import time
+import wave
+from typing import Optional
+
+from libqtile.log_utils import logger
+
+_APLAY_FORMATS = {1: "U8", 2: "S16_LE", 3: "S24_3LE", 4: "S32_LE"}
+
+
+class AplaySink:
+    """
+    `aplay` process fed raw PCM frames through stdin.
+
+    Frames are written from a worker thread, so playing never blocks the
+    caller. The process is closed once nothing was played for `idle_timeout`
+    seconds, letting the sound server suspend the sink, and started again
+    on the next write.
+    """
+
+    def __init__(
+        self, sample_width: int, rate: int, channels: int, idle_timeout: float = 5.0
+    ) -> None:
+        self.command = [
+            "aplay",
+            "-q",
+            "-t",
+            "raw",
+            "-f",
+            _APLAY_FORMATS[sample_width],
+            "-r",
+            str(rate),
+            "-c",
+            str(channels),
+        ]
+        self.idle_timeout = idle_timeout
+        self._process: Optional[subprocess.Popen] = None
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def write(self, frames: bytes) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="aplay-sink", daemon=True
+                )
+                self._thread.start()
+        self._queue.put(frames)
+
+    def close(self) -> None:
+        self._queue.put(None)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                frames = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                frames = None
+            with self._lock:
+                # A write may have come in since the timeout
+                idle = frames is None and self._queue.empty()
+                if idle:
+                    self._thread = None
+                    process, self._process = self._process, None
+            if idle:
+                self._stop(process)
+                return
+            if frames is None:
+                continue
+            try:
+                self._play(frames)
+            except OSError:
+                logger.exception("Could not play sound")
+
+    def _play(self, frames: bytes) -> None:
+        for _ in range(2):
+            if self._process is None or self._process.poll() is not None:
+                self._process = subprocess.Popen(
+                    self.command,
+                    stdin=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                )
+            try:
+                self._process.stdin.write(frames)
+                self._process.stdin.flush()
+                return
+            except BrokenPipeError:
+                self._process = None
+
+    @staticmethod
+    def _stop(process: Optional[subprocess.Popen]) -> None:
+        if process is None:
+            return
+        # Closing stdin lets aplay play what it has buffered and exit
+        try:
+            process.stdin.close()
+            process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            process.terminate()
+
+
+class NullSink:
+    """Sink that discards frames, counting what would have been played."""
+
+    def __init__(self) -> None:
+        self.played = 0
+
+    def write(self, frames: bytes) -> None:
+        self.played += 1
+
+    def close(self) -> None:
+        pass
+
+
+class Beep:
+    """
+    Short feedback sound decoded once and kept in memory.
+
+    A play request while the previous one is still sounding is dropped, so a
+    burst of volume steps plays a single beep.
+    """
+
+    def __init__(self, path: str, sink=None, enabled: bool = True) -> None:
+        self.enabled = enabled
+        with wave.open(path) as wav:
+            self.frames = wav.readframes(wav.getnframes())
+            self.duration = wav.getnframes() / wav.getframerate()
+            if sink is None:
+                sink = AplaySink(
+                    wav.getsampwidth(), wav.getframerate(), wav.getnchannels()
+                )
+        self.sink = sink
+        self._busy_until = 0.0
+        self._lock = threading.Lock()
+
+    def play(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if now < self._busy_until:
+                return
+            self._busy_until = now + self.duration
+        try:
+            self.sink.write(self.frames)
+        except OSError:
+            logger.exception("Could not play beep")
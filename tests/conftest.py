@@ -0,0 +1,38 @@
+import importlib
+
+import libqtile
+import pytest
+
+from headless import LoopQtile
+
+# Modules bind libqtile.qtile when imported, so it has to be in place before
+# any of the config's modules are
+libqtile.qtile = LoopQtile()
+
+
+def _import(name: str):
+    try:
+        return importlib.import_module(name)
+    except OSError as e:
+        # cairo or pango missing, widgets and layouts cannot be built
+        pytest.skip(f"{name} cannot be imported: {e}")
+
+
+@pytest.fixture
+def widgets():
+    return _import("widgets")
+
+
+@pytest.fixture
+def layouts():
+    return _import("layouts")
+
+
+@pytest.fixture
+def bars():
+    return _import("bars")
+
+
+@pytest.fixture
+def wallpapers():
+    return _import("wallpapers")
@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+from autostart import CONTINUE, SKIP_DEPENDENTS, Autostart, Step
+
+
+def _fail():
+    raise RuntimeError("no such command")
+
+
+def test_timed_out_step_skips_its_dependents():
+    release = threading.Event()
+    ran = []
+    autostart = Autostart(
+        [
+            Step("wifi", release.wait, timeout=0.05, on_failure=SKIP_DEPENDENTS),
+            Step("sync", lambda: ran.append("sync"), after=("wifi",)),
+            Step("compositor", lambda: ran.append("compositor")),
+        ]
+    )
+    try:
+        autostart._run()
+    finally:
+        release.set()
+
+    statuses = {name: result.status for name, result in autostart.results.items()}
+    assert statuses == {"wifi": "timeout", "sync": "skipped", "compositor": "ok"}
+    assert ran == ["compositor"]
+
+
+def test_failed_step_lets_its_dependents_run():
+    ran = []
+    autostart = Autostart(
+        [
+            Step("monitors", _fail, on_failure=CONTINUE),
+            Step("wallpapers", lambda: ran.append("wallpapers"), after=("monitors",)),
+        ]
+    )
+    finished = []
+    autostart.on_finished(finished.append)
+    autostart._run()
+
+    assert autostart.results["monitors"].status == "failed"
+    assert autostart.results["wallpapers"].status == "ok"
+    assert ran == ["wallpapers"] and finished == [autostart]
+
+
+def test_cycles_and_unknown_steps_are_rejected():
+    with pytest.raises(ValueError, match="Cyclic"):
+        Autostart(
+            [
+                Step("a", print, after=("c",)),
+                Step("b", print, after=("a",)),
+                Step("c", print, after=("b",)),
+            ]
+        )
+    with pytest.raises(ValueError, match="unknown"):
+        Autostart([Step("a", print, after=("b",))])
@@ -0,0 +1,84 @@
+import asyncio
+
+import libqtile
+
+
+class TimedWidget:
+    """Just what suspending and resuming a bar touches."""
+
+    def __init__(self, bar) -> None:
+        self.bar = bar
+        self.qtile = libqtile.qtile
+        self.configured = True
+        self._futures = []
+        self.calls = []
+
+    def timeout_add(self, seconds, name):
+        self._futures.append(self.qtile.call_later(seconds, self.calls.append, name))
+
+    def timer_setup(self):
+        self.calls.append("timer_setup")
+
+
+def _bar(bars):
+    bar = bars.Bar([], 26)
+    bar.draw = lambda: None
+    return bar
+
+
+def test_resume_restores_only_cancelled_timers(bars):
+    async def main():
+        bar = _bar(bars)
+        idle, clipboard = TimedWidget(bar), TimedWidget(bar)
+        bar.widgets = [idle, clipboard]
+        clipboard.timeout_add(0, "shown")
+        await asyncio.sleep(0.01)
+        clipboard.timeout_add(0.05, "cleared")
+
+        bar.suspend()
+        await asyncio.sleep(0.1)
+        assert clipboard.calls == ["shown"]
+
+        bar.resume()
+        await asyncio.sleep(0.01)
+        # The overdue clear runs once, the timer that had already run and the
+        # widget without timers are left alone
+        assert clipboard.calls == ["shown", "cleared"]
+        assert idle.calls == []
+
+    asyncio.run(main())
+
+
+def test_resume_keeps_remaining_delay(bars):
+    async def main():
+        bar = _bar(bars)
+        widget = TimedWidget(bar)
+        bar.widgets = [widget]
+        widget.timeout_add(0.2, "cleared")
+
+        bar.suspend()
+        bar.resume()
+        await asyncio.sleep(0.05)
+        assert widget.calls == []
+        await asyncio.sleep(0.25)
+        assert widget.calls == ["cleared"]
+
+    asyncio.run(main())
+
+
+def test_suspend_drops_handles_without_a_time(bars):
+    async def main():
+        bar = _bar(bars)
+        widget = TimedWidget(bar)
+        bar.widgets = [widget]
+        # As qtile's own call_soon on newer versions
+        widget._futures.append(widget.qtile.call_soon(widget.calls.append, "soon"))
+        widget.timeout_add(0.05, "cleared")
+
+        bar.suspend()
+        await asyncio.sleep(0.01)
+        bar.resume()
+        await asyncio.sleep(0.1)
+        assert widget.calls == ["cleared"]
+
+    asyncio.run(main())
@@ -0,0 +1,205 @@
+import asyncio
+import random
+from collections import Counter
+from types import SimpleNamespace
+
+from headless import FakeQtile, FakeWindow, HeadlessBar, configure
+
+
+def test_move_to_next_screen_lays_out_each_group_once(layouts):
+    qtile = FakeQtile([layouts.Max()], windows=2)
+    source, target, other = (screen.group for screen in qtile.screens)
+    moved = qtile.current_window
+    left, shown = source.windows[0], target.current_window
+    placements = {window: window.placements for window in (left, moved, shown)}
+    for group in (source, target, other):
+        group.layout_passes = 0
+    # Only what the move itself focuses counts
+    qtile.focused_window = None
+
+    source.layout.cmd_shuffle_right()
+
+    assert moved.group is target and qtile.current_screen.index == 1
+    # qtile's two layout_all calls per group are held, the batch's own one
+    # is the only one that lays out
+    assert [group.layout_passes for group in (source, target, other)] == [3, 3, 0]
+    assert left.placements - placements[left] == 1
+    assert moved.placements - placements[moved] == 1
+    assert not moved.hidden and shown.hidden
+    # Focusing failed while the window was hidden, the batch's pass retries
+    assert qtile.focused_window is moved
+
+
+def test_move_to_next_screen_redraws_each_bar_once(layouts, widgets):
+    qtile = FakeQtile([layouts.Columns()], windows=1)
+    draws = Counter()
+
+    class CountingBar(HeadlessBar):
+        def draw(self):
+            draws[self.screen.index] += 1
+
+    bars = []
+
+    async def main():
+        for screen in qtile.screens:
+            bar = CountingBar(screen=screen)
+            bar.widgets = [widgets.CurrentScreen(), widgets.CurrentLayout()]
+            bars.append(bar)
+            for widget in bar.widgets:
+                configure(widget, bar, qtile)
+                widget.draw = lambda index=screen.index: draws.update([index])
+        await asyncio.sleep(0)
+        qtile.run_until(0)
+        await asyncio.sleep(0)
+        draws.clear()
+
+        qtile.current_group.layout.cmd_shuffle_right()
+        await asyncio.sleep(0)
+
+        assert qtile.current_screen.index == 1
+        assert draws == {0: 1, 1: 1}
+
+    try:
+        asyncio.run(main())
+    finally:
+        for bar in bars:
+            for widget in bar.widgets:
+                widget.finalize()
+
+
+def test_coalesced_presses_keep_their_order(layouts):
+    steps = []
+
+    class Recorder:
+        def cmd_left(self):
+            steps.append("left")
+
+        def cmd_right(self):
+            steps.append("right")
+
+    class Qtile(FakeQtile):
+        current_group = SimpleNamespace(layout=Recorder())
+
+    qtile = Qtile([], screens=0)
+    coalescer = layouts.KeyCoalescer(interval=0.1)
+    left, right = coalescer.command("left"), coalescer.command("right")
+
+    for press in (left, left, right, left, left):
+        press(qtile)
+    qtile.run_until(1)
+
+    assert steps == ["left", "left", "right", "left", "left"]
+
+
+def test_coalesced_shuffles_across_screens_keep_focus(layouts):
+    qtile = FakeQtile([layouts.Columns()], windows=1)
+    moved = qtile.current_window
+    coalescer = layouts.KeyCoalescer(interval=0.1)
+    shuffle_right = coalescer.command("shuffle_right")
+
+    # The first press runs straight away, the repeats together a frame later
+    for _ in range(3):
+        shuffle_right(qtile)
+    qtile.focused_window = None
+    qtile.run_until(1)
+
+    assert moved.group is qtile.screens[2].group
+    assert qtile.current_screen.index == 2
+    assert not moved.hidden
+    assert qtile.focused_window is moved
+
+
+def _neighbours(layouts, *geometries):
+    """Neighbour lookup by geometry, for screens listed in any order."""
+    screens = [
+        SimpleNamespace(index=index, x=x, y=y, width=width, height=height)
+        for index, (x, y, width, height) in enumerate(geometries)
+    ]
+    qtile = SimpleNamespace(screens=screens)
+    neighbours = layouts.ScreenNeighbours()
+
+    def get(geometry, direction):
+        index = neighbours.get(qtile, geometries.index(geometry), direction)
+        return None if index is None else geometries[index]
+
+    return get
+
+
+def test_screen_neighbours_skip_diagonal_screens(layouts):
+    # A laptop below the left monitor, a third monitor right of the left one
+    left = (0, 0, 1920, 1080)
+    laptop = (0, 1080, 1920, 1080)
+    right = (1920, 0, 1920, 1080)
+
+    for order in ((left, laptop, right), (right, laptop, left)):
+        get = _neighbours(layouts, *order)
+        assert get(left, "right") == right and get(right, "left") == left
+        assert get(left, "down") == laptop and get(laptop, "up") == left
+        assert get(laptop, "right") is None
+        assert get(right, "down") is None
+
+
+def test_screen_neighbours_take_the_closest_stacked_screen(layouts):
+    top = (0, 0, 1920, 1080)
+    middle = (320, 1080, 1280, 1024)
+    bottom = (0, 2104, 1920, 1080)
+
+    for order in ((top, middle, bottom), (bottom, top, middle)):
+        get = _neighbours(layouts, *order)
+        assert get(top, "down") == middle and get(middle, "down") == bottom
+        assert get(bottom, "up") == middle and get(middle, "up") == top
+        assert get(top, "left") is None and get(middle, "right") is None
+
+
+class PlacedWindow(FakeWindow):
+    rect = None
+
+    def place(self, x, y, width, height, borderwidth, *args, **kwargs):
+        super().place()
+        self.rect = (x, y, width, height, borderwidth, kwargs.get("margin"))
+
+
+def test_columns_place_windows_like_stock_columns(layouts):
+    from libqtile import layout
+
+    rng = random.Random(24)
+    commands = [
+        "cmd_grow_left",
+        "cmd_grow_right",
+        "cmd_grow_up",
+        "cmd_grow_down",
+        "cmd_toggle_split",
+        "cmd_normalize",
+        # Not left and right, which move on to the next screen instead of
+        # wrapping around
+        "cmd_up",
+        "cmd_down",
+        "cmd_next",
+        "cmd_previous",
+    ]
+    qtiles = [
+        FakeQtile([cls()], screens=1, windows=0)
+        for cls in (layouts.Columns, layout.Columns)
+    ]
+    groups = [qtile.current_group for qtile in qtiles]
+
+    for step in range(300):
+        action = rng.choice(["add", "remove", "focus", "command", "command"])
+        count = len(groups[0].windows)
+        index = rng.randrange(count) if count else None
+        command = rng.choice(commands)
+        for qtile, group in zip(qtiles, groups):
+            if action == "add" or count == 0:
+                group.add(PlacedWindow(qtile, f"window {step}"))
+            elif action == "remove":
+                group.remove(group.windows[index])
+            elif action == "focus":
+                group.focus(group.windows[index])
+            else:
+                getattr(group.layout, command)()
+
+        ours, stock = (
+            [(window.rect, window.hidden) for window in group.windows]
+            for group in groups
+        )
+        assert ours == stock, (step, action, command)
@@ -0,0 +1,115 @@
+import asyncio
+import shutil
+import subprocess
+
+import pytest
+from dbus_next.aio import MessageBus
+from dbus_next.service import ServiceInterface, method
+
+from notifications import Notifier
+
+
+class FakeNotificationDaemon(ServiceInterface):
+    def __init__(self, delay: float = 0.0) -> None:
+        super().__init__("org.freedesktop.Notifications")
+        self.delay = delay
+        self.calls = []
+        self._last_id = 0
+
+    @method()
+    async def Notify(
+        self,
+        app_name: "s",  # noqa: F821
+        replaces_id: "u",  # noqa: F821
+        app_icon: "s",  # noqa: F821
+        summary: "s",  # noqa: F821
+        body: "s",  # noqa: F821
+        actions: "as",  # noqa: F821
+        hints: "a{sv}",  # noqa: F821
+        expire_timeout: "i",  # noqa: F821
+    ) -> "u":  # noqa: F821
+        self.calls.append((replaces_id, summary, hints["value"].value))
+        await asyncio.sleep(self.delay)
+        if replaces_id:
+            return replaces_id
+        self._last_id += 1
+        return self._last_id
+
+
+@pytest.fixture
+def bus_address():
+    if shutil.which("dbus-daemon") is None:
+        pytest.skip("dbus-daemon is not installed")
+    daemon = subprocess.Popen(
+        ["dbus-daemon", "--session", "--nofork", "--print-address=1"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        yield daemon.stdout.readline().strip()
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+
+async def _serve(address: str, daemon: FakeNotificationDaemon) -> MessageBus:
+    bus = await MessageBus(bus_address=address).connect()
+    bus.export("/org/freedesktop/Notifications", daemon)
+    await bus.request_name("org.freedesktop.Notifications")
+    return bus
+
+
+def test_bursts_collapse_into_one_bubble(bus_address):
+    async def main():
+        daemon = FakeNotificationDaemon()
+        service = await _serve(bus_address, daemon)
+        notifier = Notifier(
+            bus_address=bus_address, debounce=0.02, loop=asyncio.get_running_loop()
+        )
+        for value in range(5):
+            notifier.notify("Volume:", value=value)
+        await asyncio.sleep(0.2)
+        for value in range(5, 10):
+            notifier.notify("Volume:", value=value)
+        await asyncio.sleep(0.2)
+        notifier.close()
+        service.disconnect()
+        return daemon.calls
+
+    assert asyncio.run(main()) == [(0, "Volume:", 4), (1, "Volume:", 9)]
+
+
+def test_overlapping_sends_reuse_the_bubble(bus_address):
+    async def main():
+        # Replies slower than the debounce, the second send starts while the
+        # first has no id yet
+        daemon = FakeNotificationDaemon(delay=0.1)
+        service = await _serve(bus_address, daemon)
+        notifier = Notifier(
+            bus_address=bus_address, debounce=0.01, loop=asyncio.get_running_loop()
+        )
+        notifier.notify("Volume:", value=1)
+        await asyncio.sleep(0.05)
+        notifier.notify("Volume:", value=2)
+        await asyncio.sleep(0.5)
+        notifier.close()
+        service.disconnect()
+        return daemon.calls
+
+    assert asyncio.run(main()) == [(0, "Volume:", 1), (1, "Volume:", 2)]
+
+
+def test_send_failures_are_logged(bus_address, caplog):
+    async def main():
+        # Nobody owns the name, the call comes back as an error
+        notifier = Notifier(
+            bus_address=bus_address, debounce=0.01, loop=asyncio.get_running_loop()
+        )
+        notifier.notify("Volume:", value=1)
+        await asyncio.sleep(0.3)
+        notifier.close()
+        return notifier
+
+    assert asyncio.run(main()).notification_id == 0
+    assert "Unable to send notification" in caplog.text
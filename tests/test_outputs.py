@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from libqtile.config import Screen
+
+import outputs
+from outputs import Output, ScreenBuilder
+
+
+def _builder(fallback="HDMI-A-0"):
+    return ScreenBuilder(
+        {"HDMI-A-0": Screen, "DisplayPort-0": Screen}, fallback=fallback
+    )
+
+
+def _output(name, x=0, y=0):
+    return Output(name, x, y, 1920, 1080)
+
+
+def test_unknown_output_gets_fallback_only_when_it_is_missing():
+    builder = _builder()
+
+    assert builder._assign([_output("eDP-1")]) == ["HDMI-A-0"]
+    assert builder._assign([_output("eDP-1"), _output("HDMI-A-0")]) == [
+        None,
+        "HDMI-A-0",
+    ]
+    # The fallback builds a single screen
+    assert builder._assign([_output("eDP-1"), _output("DVI-0")]) == [
+        "HDMI-A-0",
+        None,
+    ]
+
+
+def test_order_merges_mirrors_and_follows_the_backend(monkeypatch):
+    info = [(1920, 0, 1920, 1080), (0, 0, 1920, 1080)]
+    core = SimpleNamespace(get_screen_info=lambda: info)
+    monkeypatch.setattr(outputs, "qtile", SimpleNamespace(core=core))
+    left, mirror = _output("HDMI-A-0"), _output("eDP-1")
+    right = _output("DisplayPort-0", x=1920)
+
+    assert _builder()._order([left, mirror, right]) == [right, left]
+
+
+def test_update_reuses_screens_and_drops_missing_ones(monkeypatch):
+    monkeypatch.setattr(outputs, "qtile", None)
+    connected = [_output("HDMI-A-0"), _output("DisplayPort-0", x=1920)]
+    monkeypatch.setattr(outputs, "connected_outputs", lambda: connected)
+    builder = _builder()
+    screens = builder.screens
+
+    builder.update()
+    main, side = screens
+    connected.pop()
+    builder.update()
+    assert screens == [main]
+    connected.append(_output("DisplayPort-0", x=1920))
+    builder.update()
+
+    assert builder.screens is screens
+    assert screens[0] is main and screens[1] is not side
@@ -0,0 +1,35 @@
+import time
+import wave
+
+from sounds import Beep, NullSink
+
+
+def _beep(tmp_path, **kwargs):
+    path = tmp_path / "beep.wav"
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(8000)
+        # Half a second of silence
+        wav.writeframes(b"\0\0" * 4000)
+    return Beep(str(path), sink=NullSink(), **kwargs)
+
+
+def test_burst_of_plays_sounds_once(tmp_path, monkeypatch):
+    beep = _beep(tmp_path)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+
+    for _ in range(5):
+        beep.play()
+    assert beep.sink.played == 1
+
+    now += beep.duration
+    beep.play()
+    assert beep.sink.played == 2
+
+
+def test_disabled_beep_plays_nothing(tmp_path):
+    beep = _beep(tmp_path, enabled=False)
+    beep.play()
+    assert beep.sink.played == 0
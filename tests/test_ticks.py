@@ -0,0 +1,28 @@
+import asyncio
+import time
+
+from ticks import TickScheduler
+
+
+def test_ticks_land_on_wall_clock_multiples():
+    async def main():
+        scheduler = TickScheduler()
+        fired = asyncio.get_running_loop().create_future()
+        scheduler.call_aligned(0.5, lambda: fired.set_result(time.time()))
+        phase = await asyncio.wait_for(fired, 1) % 0.5
+        assert min(phase, 0.5 - phase) < 0.05
+
+    asyncio.run(main())
+
+
+def test_wall_clock_step_back_does_not_hold_timers(monkeypatch):
+    async def main():
+        scheduler = TickScheduler()
+        fired = asyncio.get_running_loop().create_future()
+        scheduler.call_aligned(0.05, fired.set_result, True)
+        # As NTP correcting a fast clock would
+        stepped = time.time() - 3600
+        monkeypatch.setattr(time, "time", lambda: stepped)
+        assert await asyncio.wait_for(fired, 1)
+
+    asyncio.run(main())
@@ -0,0 +1,42 @@
+import json
+
+from titles import DEFAULT_RULES, TitleParser, TitleRule, load_rules
+
+
+def _write_rules(tmp_path, entries):
+    path = tmp_path / "title_rules.json"
+    path.write_text(json.dumps(entries))
+    return str(path)
+
+
+def test_rules_are_tried_in_order():
+    parser = TitleParser([TitleRule("mail", "mail"), *DEFAULT_RULES])
+    assert parser("Inbox (3) - mail - Google Chrome") == "chrome"
+    assert parser("Inbox (3) - Mail in Firefox") == "mail"
+    assert parser("~/dev/widgets.py - NVIM") == "nvim"
+    assert parser("Something else") == "something else"
+
+
+def test_rules_are_compiled_on_their_own(tmp_path):
+    path = _write_rules(
+        tmp_path,
+        [
+            {"pattern": "(?P<app>slack)", "name": "slack"},
+            # Group names and inline flags don't clash with other rules
+            {"pattern": "(?P<app>discord)", "name": "discord"},
+            {"pattern": "(?s)teams", "name": "teams"},
+        ],
+    )
+    rules = load_rules(path)
+    assert [rule.name for rule in rules] == ["slack", "discord", "teams"]
+    parser = TitleParser([*rules, *DEFAULT_RULES])
+    assert parser("general - Slack") == "slack"
+    assert parser("general - Discord") == "discord"
+
+
+def test_broken_entries_are_skipped(tmp_path):
+    path = _write_rules(
+        tmp_path,
+        [{"pattern": "("}, {"pattern": "x", "name": "{unknown}"}, "text"],
+    )
+    assert load_rules(path) == []
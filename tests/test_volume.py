@@ -0,0 +1,129 @@
+import asyncio
+import itertools
+import subprocess
+import sys
+import threading
+
+import libqtile
+
+from headless import FakeQtile, configure
+from volume import FakeVolumeEvents, PactlEvents, VolumeController
+
+
+def _fake_pactl(tmp_path, lines):
+    script = tmp_path / "pactl.py"
+    script.write_text(
+        "".join(f"print({line!r})\n" for line in lines) + "import sys; sys.exit(1)\n"
+    )
+    return f"{sys.executable} {script}"
+
+
+def test_pactl_events_restart_after_exit(tmp_path):
+    command = _fake_pactl(tmp_path, ["Event 'change' on sink #1"])
+    events = PactlEvents(command, restart_delay=0.01, max_restart_delay=0.05)
+    changes = []
+    ended = threading.Event()
+    events.subscribe(lambda: changes.append(None), ended.set)
+    try:
+        assert events.start()
+        assert ended.wait(5)
+        # The restarted process reports its own change, on top of the one
+        # announcing the restart
+        for _ in range(500):
+            if len(changes) >= 3:
+                break
+            threading.Event().wait(0.01)
+        assert len(changes) >= 3
+    finally:
+        events.stop()
+
+
+def test_pactl_events_stay_stopped(tmp_path):
+    events = PactlEvents(_fake_pactl(tmp_path, []), restart_delay=0.01)
+    ended = threading.Event()
+    events.subscribe(lambda: None, ended.set)
+    events.start()
+    events.stop()
+    assert not ended.wait(0.2)
+    assert not events.running
+
+
+def test_generic_volume_follows_events(widgets, monkeypatch):
+    monkeypatch.setattr(widgets.volume_notifier, "notify", lambda *a, **k: None)
+    events = FakeVolumeEvents()
+    widget = widgets.GenericVolume(events=events)
+    volumes = itertools.chain([30, 45], itertools.repeat(45))
+    polls = []
+
+    def get_volume():
+        polls.append(None)
+        return next(volumes)
+
+    monkeypatch.setattr(widget, "_get_volume", get_volume)
+
+    async def main():
+        configure(widget, qtile=libqtile.qtile)
+        await asyncio.sleep(0.1)
+        assert events.running
+        assert widget.volume == 30
+        assert widget.update_interval == widget.fallback_interval
+
+        events.emit()
+        await asyncio.sleep(0.1)
+        assert widget.volume == 45
+        assert len(polls) == 2
+
+        # Without events the widget polls again right away
+        events.end()
+        await asyncio.sleep(0.1)
+        assert len(polls) >= 3
+        assert widget.update_interval < widget.fallback_interval
+        widget.finalize()
+
+    asyncio.run(main())
+
+
+def test_generic_volume_keeps_last_text_when_poll_times_out(widgets, monkeypatch):
+    monkeypatch.setattr(widgets.volume_notifier, "notify", lambda *a, **k: None)
+    widget = widgets.GenericVolume(events=FakeVolumeEvents())
+    monkeypatch.setattr(widget, "_get_volume", lambda: 40)
+    text = widget._poll_func()
+
+    def hung():
+        raise subprocess.TimeoutExpired("pulsemixer --get-volume", 1)
+
+    monkeypatch.setattr(widget, "_get_volume", hung)
+    assert widget._poll_func() == text
+    assert widget.stale and widget.volume == 40
+
+    monkeypatch.setattr(widget, "_get_volume", lambda: 40)
+    assert widget._poll_func() == text
+    assert not widget.stale
+
+
+def test_volume_steps_within_window_are_applied_together(monkeypatch):
+    controller = VolumeController(window=0.05)
+    applied = []
+    done = threading.Event()
+
+    def apply(delta):
+        applied.append(delta)
+        done.set()
+
+    monkeypatch.setattr(controller, "_apply", apply)
+    for delta in (5, 5, -2, 5):
+        controller.change(delta)
+
+    assert done.wait(1)
+    threading.Event().wait(0.1)
+    assert applied == [13]
+
+
+def test_finalized_volume_widgets_close_the_notifier(widgets, monkeypatch):
+    closed = []
+    monkeypatch.setattr(widgets.volume_notifier, "close", lambda: closed.append(1))
+
+    for widget in (widgets.GenericVolume(backend="poll"), widgets.Volume()):
+        configure(widget, qtile=FakeQtile([], screens=0))
+        widget.finalize()
+    assert len(closed) == 2
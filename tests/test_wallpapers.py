@@ -0,0 +1,16 @@
+import os
+import time
+
+
+def test_prune_drops_stale_partial_renders(wallpapers, tmp_path):
+    cache = wallpapers.WallpaperCache(str(tmp_path), max_entries=2)
+    now = time.time()
+    for age, name in enumerate(["a.png", "b.png", "c.png", "killed.png.part"]):
+        path = tmp_path / name
+        path.write_bytes(b"")
+        os.utime(path, (now - age * 3600, now - age * 3600))
+    (tmp_path / "writing.png.part").write_bytes(b"")
+
+    cache.prune()
+
+    assert sorted(os.listdir(tmp_path)) == ["a.png", "b.png", "writing.png.part"]
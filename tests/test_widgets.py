@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import time
+
+import libqtile
+
+from headless import configure
+
+
+def test_hung_poll_keeps_loop_responsive(widgets):
+    from libqtile.widget.base import ThreadPoolText
+
+    release = threading.Event()
+
+    class HangingPoller(ThreadPoolText):
+        def poll(self):
+            release.wait(5)
+            return "done"
+
+    widget = HangingPoller("", update_interval=600)
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        configure(widget, qtile=libqtile.qtile)
+        await asyncio.sleep(0.05)
+        assert not widget.future.done()
+
+        ran = loop.create_future()
+        scheduled = time.monotonic()
+        libqtile.qtile.call_soon(lambda: ran.set_result(time.monotonic()))
+        assert await asyncio.wait_for(ran, 1) - scheduled < 0.1
+        release.set()
+        widget.finalize()
+
+    try:
+        asyncio.run(main())
+    finally:
+        release.set()
+
+
+def test_powerline_group_registers_and_tracks_hovered_child(widgets):
+    from libqtile.widget.textbox import TextBox
+
+    from headless import HeadlessQtile
+
+    events = []
+
+    class Recording(TextBox):
+        def mouse_enter(self, x, y):
+            events.append(("enter", self.name))
+
+        def mouse_leave(self, x, y):
+            events.append(("leave", self.name))
+
+    first = Recording("first", name="first")
+    second = Recording("second", name="second")
+    group = widgets.PowerlineGroup(
+        [first, widgets.Separator("right", "ffffff", "000000"), second]
+    )
+    qtile = HeadlessQtile()
+    registered = []
+    qtile.register_widget = registered.append
+    configure(group, qtile=qtile)
+    assert registered == [first, second]
+
+    group.mouse_enter(1, 1)
+    group.mouse_move(2, 1)
+    group.mouse_move(second.offsetx - group.offsetx + 1, 1)
+    group.mouse_leave(group.length + 1, 1)
+    assert events == [
+        ("enter", "first"),
+        ("leave", "first"),
+        ("enter", "second"),
+        ("leave", "second"),
+    ]
+
+
+def test_adaptive_polling_backs_off_until_poked(widgets):
+    from libqtile.widget.generic_poll_text import GenPollText
+
+    class Stable(widgets._AdaptivePolling, GenPollText):
+        pass
+
+    now = [0.0]
+    widget = Stable(
+        func=lambda: "stable",
+        min_interval=0.2,
+        max_interval=5,
+        backoff=2,
+        active_period=10,
+        clock=lambda: now[0],
+    )
+
+    async def main():
+        configure(widget, qtile=libqtile.qtile)
+        widget.update("stable")
+        assert widget.update_interval == 0.2
+
+        intervals = []
+        for _ in range(6):
+            widget.update("stable")
+            intervals.append(widget.update_interval)
+        assert intervals == [0.4, 0.8, 1.6, 3.2, 5, 5]
+
+        widget.poke()
+        assert widget.update_interval == 0.2
+        # Unchanged values keep the fast rate while the interaction is recent
+        widget.update("stable")
+        assert widget.update_interval == 0.2
+        now[0] = 11
+        widget.update("stable")
+        assert widget.update_interval == 0.4
+        widget.finalize()
+
+    asyncio.run(main())
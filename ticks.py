@@ -0,0 +1,116 @@
+import asyncio
+import math
+import time
+from typing import Any, Callable, Dict, List
+
+from libqtile import qtile
+from libqtile.log_utils import logger
+
+# Deadlines closer than this are merged into one wakeup
+RESOLUTION = 0.001
+
+
+class TickHandle:
+    """
+    Timer handle, compatible with what widgets keep in `_futures`. `when` is
+    in event loop time, like asyncio's.
+    """
+
+    def __init__(self, when: float, func: Callable, args: tuple) -> None:
+        self._when = when
+        self._func = func
+        self._args = args
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def when(self) -> float:
+        return self._when
+
+
+class TickScheduler:
+    """
+    Run callbacks on wall-clock multiples of an interval, with one event loop
+    timer per distinct deadline.
+
+    A callback due in 60s fires exactly on the minute and one due in 0.2s on
+    the next fifth of a second, so widgets polling at the same or commensurate
+    rates wake the process together. `report` tells how many wakeups that
+    saves compared to one timer per callback.
+
+    The wall clock only sets the phase of a new deadline. Deadlines are kept
+    and fired on the event loop's monotonic clock, so the wall clock being
+    stepped, as NTP does, cannot hold timers back or fire them early.
+    """
+
+    def __init__(self) -> None:
+        self.wakeups = 0
+        self.calls = 0
+        self._started = time.monotonic()
+        self._slots: Dict[int, List[TickHandle]] = {}
+        self._timer = None
+        self._timer_slot = None
+
+    def call_aligned(self, interval: float, func: Callable, *args: Any) -> TickHandle:
+        """Call `func` on the first multiple of `interval` from now."""
+        wall = time.time()
+        aligned = (math.floor((wall + RESOLUTION) / interval) + 1) * interval
+        deadline = asyncio.get_running_loop().time() + aligned - wall
+        slot = round(deadline / RESOLUTION)
+        handle = TickHandle(deadline, func, args)
+        self._slots.setdefault(slot, []).append(handle)
+        self._arm()
+        return handle
+
+    def _arm(self) -> None:
+        while self._slots:
+            slot = min(self._slots)
+            if any(not handle.cancelled() for handle in self._slots[slot]):
+                break
+            del self._slots[slot]
+        else:
+            slot = None
+
+        if slot == self._timer_slot:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._timer_slot = slot
+        if slot is not None:
+            delay = max(0.0, slot * RESOLUTION - asyncio.get_running_loop().time())
+            self._timer = qtile.call_later(delay, self._fire)
+
+    def _fire(self) -> None:
+        self._timer = None
+        self._timer_slot = None
+        limit = (asyncio.get_running_loop().time() + RESOLUTION) / RESOLUTION
+        due = sorted(slot for slot in self._slots if slot <= limit)
+        handles = [handle for slot in due for handle in self._slots.pop(slot)]
+        handles = [handle for handle in handles if not handle.cancelled()]
+        if handles:
+            self.wakeups += 1
+            self.calls += len(handles)
+        for handle in handles:
+            try:
+                handle._func(*handle._args)
+            except Exception:
+                logger.exception("Tick callback failed")
+        self._arm()
+
+    def saved_per_second(self) -> float:
+        elapsed = time.monotonic() - self._started
+        return (self.calls - self.wakeups) / elapsed if elapsed > 0 else 0.0
+
+    def report(self) -> str:
+        return (
+            f"Ticks: {self.calls} timer callbacks in {self.wakeups} wakeups, "
+            f"{self.saved_per_second():.2f} wakeups/s saved"
+        )
+
+
+ticks = TickScheduler()
@@ -0,0 +1,92 @@
+import json
+import re
+from functools import lru_cache
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from libqtile.log_utils import logger
+
+
+class TitleRule(NamedTuple):
+    """
+    Titles matching `pattern` (a regular expression searched in the
+    lower-cased title) are shown as `name`. `name` may use `{title}` and
+    `{basename}`, the title's last path component.
+    """
+
+    pattern: str
+    name: str
+
+
+DEFAULT_RULES = (
+    TitleRule("google chrome", "chrome"),
+    TitleRule("firefox", "firefox"),
+    TitleRule("visual studio code", "vscode"),
+    TitleRule("edge", "edge"),
+    TitleRule("nvim", "{basename}"),
+)
+
+
+def load_rules(path: str) -> List[TitleRule]:
+    """
+    Read extra rules from a JSON list of {"pattern": ..., "name": ...}
+    objects. Broken files and entries are logged and skipped.
+    """
+    if not path:
+        return []
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError):
+        logger.exception("Could not read title rules from %s", path)
+        return []
+
+    rules: List[TitleRule] = []
+    for entry in entries if isinstance(entries, list) else []:
+        try:
+            rule = TitleRule(entry["pattern"], entry["name"])
+            re.compile(rule.pattern)
+            rule.name.format(title="", basename="")
+        except (KeyError, IndexError, TypeError, ValueError, re.error):
+            logger.warning("Skipping invalid title rule %r in %s", entry, path)
+            continue
+        rules.append(rule)
+    return rules
+
+
+def compile_rules(
+    rules: Sequence[TitleRule],
+) -> List[Tuple[Callable[[str], Optional[re.Match]], TitleRule]]:
+    """Each rule's compiled `search`, paired with the rule, in order."""
+    return [(re.compile(rule.pattern).search, rule) for rule in rules]
+
+
+class TitleParser:
+    """
+    Shorten window titles for the task list.
+
+    The part after the last " - " is searched for each rule's pattern, in
+    order, and the first rule that matches wins. Results for recent titles
+    are kept in an LRU cache, since the task list reparses every title on
+    each redraw.
+    """
+
+    def __init__(self, rules: Sequence[TitleRule], cache_size: int = 512) -> None:
+        self.rules = list(rules)
+        self._matchers = compile_rules(self.rules)
+        self.parse = lru_cache(maxsize=cache_size)(self._parse)
+
+    def _parse(self, title: str) -> str:
+        text = title.lower()
+        if " - " in text:
+            text = text.split(" - ")[-1]
+        for search, rule in self._matchers:
+            if search(text):
+                if "{" not in rule.name:
+                    return rule.name
+                return rule.name.format(title=text, basename=text.split("/")[-1])
+        return text
+
+    def __call__(self, title: str) -> str:
+        return self.parse(title)
@@ -0,0 +1,240 @@
+import re
+import subprocess
+import threading
+import time
+from typing import Callable, List, Optional
+
+from libqtile.log_utils import logger
+
+
+class VolumeEvents:
+    """Source of sink volume change notifications."""
+
+    def __init__(self) -> None:
+        self._callbacks: List[Callable[[], None]] = []
+        self._end_callbacks: List[Callable[[], None]] = []
+
+    @property
+    def running(self) -> bool:
+        return False
+
+    def subscribe(
+        self,
+        callback: Callable[[], None],
+        ended: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Call `callback` on every change, and `ended` if the source stops
+        without being asked to."""
+        self._callbacks.append(callback)
+        if ended is not None:
+            self._end_callbacks.append(ended)
+
+    def unsubscribe(
+        self,
+        callback: Callable[[], None],
+        ended: Optional[Callable[[], None]] = None,
+    ) -> None:
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+        if ended in self._end_callbacks:
+            self._end_callbacks.remove(ended)
+
+    def start(self) -> bool:
+        return self.running
+
+    def stop(self) -> None:
+        pass
+
+    def _notify(self) -> None:
+        for callback in list(self._callbacks):
+            callback()
+
+    def _notify_end(self) -> None:
+        for callback in list(self._end_callbacks):
+            callback()
+
+
+class PactlEvents(VolumeEvents):
+    """
+    Follow `pactl subscribe` and notify on sink or server changes.
+
+    Works on both PulseAudio and PipeWire (through pipewire-pulse). Callbacks
+    run on the reader thread. If pactl exits, for instance when the sound
+    server restarts, it is started again after `restart_delay` seconds,
+    doubling up to `max_restart_delay` while it keeps exiting.
+    """
+
+    _event_re = re.compile(r"^Event '(new|change|remove)' on (sink|server) #")
+
+    def __init__(
+        self,
+        command: str = "pactl subscribe",
+        restart_delay: float = 1.0,
+        max_restart_delay: float = 60.0,
+    ) -> None:
+        super().__init__()
+        self.command = command
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self._process: Optional[subprocess.Popen] = None
+        self._stopped = True
+        self._restarts = 0
+        self._started_at = 0.0
+        self._restart_timer: Optional[threading.Timer] = None
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> bool:
+        self._stopped = False
+        return self._spawn()
+
+    def _spawn(self) -> bool:
+        if self.running:
+            return True
+        try:
+            self._process = subprocess.Popen(
+                self.command.split(),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        except OSError:
+            logger.warning(
+                "Could not run '%s', volume falls back to polling", self.command
+            )
+            return False
+        self._started_at = time.monotonic()
+        threading.Thread(
+            target=self._read,
+            args=(self._process,),
+            name="pactl-subscribe",
+            daemon=True,
+        ).start()
+        return True
+
+    def stop(self) -> None:
+        self._stopped = True
+        if self._restart_timer is not None:
+            self._restart_timer.cancel()
+            self._restart_timer = None
+        if self._process is not None:
+            self._process.terminate()
+            self._process = None
+
+    def _read(self, process: subprocess.Popen) -> None:
+        for line in process.stdout:
+            if self._event_re.match(line):
+                self._notify()
+        process.wait()
+        if process is not self._process or self._stopped:
+            return
+        self._process = None
+        if time.monotonic() - self._started_at > self.max_restart_delay:
+            self._restarts = 0
+        delay = min(self.restart_delay * 2**self._restarts, self.max_restart_delay)
+        self._restarts += 1
+        logger.warning(
+            "'%s' exited, volume falls back to polling, restarting it in %ss",
+            self.command,
+            delay,
+        )
+        self._notify_end()
+        self._restart_timer = threading.Timer(delay, self._restart)
+        self._restart_timer.daemon = True
+        self._restart_timer.start()
+
+    def _restart(self) -> None:
+        self._restart_timer = None
+        if not self._stopped and self._spawn():
+            # Changes made while it was down went unnoticed
+            self._notify()
+
+
+class FakeVolumeEvents(VolumeEvents):
+    """Event source driven by hand, to exercise widgets without a sound server."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self) -> bool:
+        self._running = True
+        return True
+
+    def stop(self) -> None:
+        self._running = False
+
+    def emit(self) -> None:
+        self._notify()
+
+    def end(self) -> None:
+        """Stop as if the event stream had ended on its own."""
+        self._running = False
+        self._notify_end()
+
+
+class VolumeController:
+    """
+    Coalesce relative volume steps into a single pulsemixer call.
+
+    Steps arriving within `window` seconds of the first one are summed and
+    applied together, so a fast scroll or a held media key costs one or two
+    processes instead of one per tick.
+    """
+
+    def __init__(
+        self, window: float = 0.05, max_volume: int = 100, timeout: float = 2.0
+    ) -> None:
+        self.window = window
+        self.max_volume = max_volume
+        self.timeout = timeout
+        self._pending = 0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._apply_lock = threading.Lock()
+
+    def change(self, delta: int) -> None:
+        with self._lock:
+            self._pending += delta
+            if self._timer is None:
+                self._timer = threading.Timer(self.window, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush(self) -> None:
+        with self._lock:
+            delta, self._pending = self._pending, 0
+            self._timer = None
+        if delta == 0:
+            return
+        # Serialize backend calls so consecutive batches never race each other
+        with self._apply_lock:
+            self._apply(delta)
+
+    def _apply(self, delta: int) -> None:
+        # Bounded, so a hung pulsemixer cannot hold the lock for later batches
+        try:
+            subprocess.run(
+                [
+                    "pulsemixer",
+                    "--change-volume",
+                    f"{delta:+d}",
+                    "--max-volume",
+                    str(self.max_volume),
+                ],
+                timeout=self.timeout,
+            )
+        except subprocess.TimeoutExpired:
+            logger.warning(
+                "pulsemixer did not finish in %ss, volume change of %+d dropped",
+                self.timeout,
+                delta,
+            )
+        except OSError:
+            logger.exception("Could not run pulsemixer")
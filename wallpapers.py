@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Optional, Sequence, Tuple
+
+import cairocffi
+import numpy as np
+
+RENDERER_VERSION = 1
+
+
+class WallpaperCache:
+    """
+    Content-addressed store for generated wallpapers.
+
+    Entries are PNG files named after a hash of everything that affects the
+    image. Hits refresh the file's mtime, and `prune` drops the least
+    recently used entries beyond `max_entries`.
+    """
+
+    def __init__(
+        self,
+        directory: str = os.path.expanduser("~/.cache/qtile/wallpapers"),
+        max_entries: int = 12,
+        partial_timeout: float = 600,
+    ) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+        self.partial_timeout = partial_timeout
+
+    def key(self, **params: Any) -> str:
+        payload = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def prune(self) -> None:
+        """
+        Drop entries beyond `max_entries`, and partial files that renders
+        killed halfway through left behind.
+        """
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return
+        stale = time.time() - self.partial_timeout
+        pngs = []
+        for entry in entries:
+            try:
+                if entry.name.endswith(".png"):
+                    pngs.append((entry.stat().st_mtime, entry.path))
+                elif entry.name.endswith(".png.part"):
+                    # A recent one may still be being written
+                    if entry.stat().st_mtime < stale:
+                        os.remove(entry.path)
+            except OSError:
+                pass
+        pngs.sort(reverse=True)
+        for _, path in pngs[self.max_entries :]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _bgra(color: str) -> Tuple[int, int, int, int]:
+    color = color.lstrip("#")
+    red, green, blue = (int(color[i : i + 2], 16) for i in (0, 2, 4))
+    return blue, green, red, 255
+
+
+def render_radial_bands(
+    width: int,
+    height: int,
+    center: Tuple[float, float],
+    radius: float,
+    colors: Sequence[str],
+) -> np.ndarray:
+    """
+    Render concentric color bands around `center`, one band per color over
+    `radius` pixels, the last color filling everything beyond it.
+
+    Returns a (height, width, 4) array laid out as cairo's ARGB32.
+    """
+    ys, xs = np.ogrid[:height, :width]
+    distance = np.hypot(xs - center[0], ys - center[1])
+    bands = (distance * (len(colors) / radius)).astype(np.intp)
+    np.minimum(bands, len(colors) - 1, out=bands)
+    palette = np.array([_bgra(color) for color in colors], dtype=np.uint8)
+    return palette[bands]
+
+
+def write_png(pixels: np.ndarray, path: str) -> None:
+    height, width, _ = pixels.shape
+    surface = cairocffi.ImageSurface.create_for_data(
+        np.ascontiguousarray(pixels), cairocffi.FORMAT_ARGB32, width, height
+    )
+    surface.write_to_png(path)
+    surface.finish()
@@ -1,17 +1,40 @@
-import math
+import abc
+import itertools
+import re
 import subprocess
-from typing import Any, Iterable, List, Tuple, Union
+import time
+import weakref
+from typing import Any, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
 
-from libqtile import bar, hook, widget
+import psutil
+from libqtile import bar, hook
+from libqtile.log_utils import logger
 from libqtile.widget import base
 from libqtile.widget.base import _Widget
+from libqtile.widget.clock import Clock as BuiltinClock
+from libqtile.widget.cpu import CPU as BuiltinCPU
 from libqtile.widget.currentscreen import CurrentScreen as BuiltinCurrentScreen
 from libqtile.widget.generic_poll_text import GenPollText
-from libqtile.widget.textbox import TextBox
+from libqtile.widget.graph import CPUGraph as BuiltinCPUGraph
+from libqtile.widget.graph import MemoryGraph as BuiltinMemoryGraph
+from libqtile.widget.graph import NetGraph as BuiltinNetGraph
+from libqtile.widget.memory import Memory as BuiltinMemory
+from libqtile.widget.net import Net as BuiltinNet
+from libqtile.widget.sensors import ThermalSensor as BuiltinThermalSensor
+from libqtile.widget.tasklist import TaskList as BuiltinTaskList
 from libqtile.widget.volume import Volume as BuiltinVolume
 
 from colors import kanagawa
+from meta_config import TITLE_RULES
+from metrics import sampler
+from notifications import URGENCY_LOW, Notifier
+from redraw import redraws
 from scripts import decrease_volume, increase_volume, toggle_audio_profile
+from ticks import ticks
+from titles import DEFAULT_RULES, TitleParser, load_rules
+from volume import PactlEvents
+
+volume_notifier = Notifier()
 
 
 class CurrentLayout(base._TextBox):
@@ -45,8 +68,10 @@ class CurrentLayout(base._TextBox):
 
     def hook_response(self, layout, group):
         if group.screen is not None and group.screen == self.bar.screen:
-            self.text = self._icon_mapping.get(layout.name, self._fallback_icon)
-            self.bar.draw()
+            text = self._icon_mapping.get(layout.name, self._fallback_icon)
+            if text != self.text:
+                self.text = text
+                redraws.mark(self)
 
     def setup_hooks(self):
         hook.subscribe.layout_change(self.hook_response)
@@ -56,6 +81,7 @@ class CurrentLayout(base._TextBox):
 
     def finalize(self):
         self.remove_hooks()
+        redraws.forget(self)
         base._TextBox.finalize(self)
 
 
@@ -75,101 +101,283 @@ class CurrentScreen(BuiltinCurrentScreen):
         ]
         base._TextBox.__init__(self, "", width, **config)
         self.add_defaults(BuiltinCurrentScreen.defaults + defaults)
+        self._active = None
 
     def update_text(self):
-        super().update_text()
-        if self.qtile.current_screen == self.bar.screen:
+        active = self.qtile.current_screen == self.bar.screen
+        if active == self._active:
+            return
+        self._active = active
+        if active:
+            self.foreground = self.active_color
             self.background = self.active_background_color
-            self.update(self.active_text)
+            self.text = self.active_text
         else:
+            self.foreground = self.inactive_color
             self.background = self.inactive_background_color
-            self.update(self.inactive_text)
-        self.draw()
-
+            self.text = self.inactive_text
+        redraws.mark(self)
 
-class Terminator(TextBox):
-    def __init__(self, hack_offset: int = -1, **config: Any) -> None:
-        super().__init__(**config)
-        self.hack_offset = hack_offset
-
-    def draw(self):
-        if not self.can_draw():
-            return
-        self.drawer.clear(self.background or self.bar.background)
+    def finalize(self):
+        hook.unsubscribe.current_screen_change(self.update_text)
+        redraws.forget(self)
+        super().finalize()
+
+
+def draw_triangle(
+    drawer,
+    horizontal: bool,
+    start: int,
+    length: int,
+    breadth: int,
+    direction: str,
+    foreground: str,
+    background: str,
+) -> None:
+    """
+    Paint a powerline triangle over `background` into the `length` pixels
+    of `drawer` that begin `start` pixels along the bar.
+    """
+    ctx = drawer.ctx
+    drawer.set_source_rgb(background)
+    if horizontal:
+        ctx.rectangle(start, 0, length, breadth)
+    else:
+        ctx.rectangle(0, start, breadth, length)
+    ctx.fill()
+
+    points = [(0, 0), (length, breadth / 2), (0, breadth)]
+    if direction == "left":
+        points = [(length - x, y) for x, y in points]
+    points = [(start + x, y) for x, y in points]
+    if not horizontal:
+        points = [(y, x) for x, y in points]
+
+    ctx.move_to(*points[0])
+    for point in points[1:]:
+        ctx.line_to(*point)
+    ctx.close_path()
+    drawer.set_source_rgb(foreground)
+    ctx.fill()
+
+
+class Terminator(base._Widget):
+    """
+    Powerline separator drawn as a filled triangle spanning the bar.
 
-        # size = self.bar.height if self.bar.horizontal else self.bar.width
-        self.drawer.ctx.save()
+    The triangle points along the bar, towards its end for direction "right"
+    and towards its start for "left". Drawing is a single vector path, so it
+    does not depend on a patched font or on font metrics.
+    """
 
-        if not self.bar.horizontal:
-            # Left bar reads bottom to top
-            if self.bar.screen.left is self.bar:
-                self.drawer.ctx.rotate(-90 * math.pi / 180.0)
-                self.drawer.ctx.translate(-self.length, 0)
+    orientations = base.ORIENTATION_BOTH
+    defaults = [
+        ("foreground", "ffffff", "Triangle color"),
+        ("direction", "right", "Direction the triangle points to, 'left' or 'right'"),
+        ("size", 24, "Twice the triangle's width along the bar, it spans the bar"),
+    ]
 
-            # Right bar is top to bottom
-            else:
-                self.drawer.ctx.translate(self.bar.width, 0)
+    def __init__(self, **config: Any) -> None:
+        super().__init__(bar.CALCULATED, **config)
+        self.add_defaults(Terminator.defaults)
 
-                self.drawer.ctx.rotate(90 * math.pi / 180.0)
+    def calculate_length(self):
+        return self.size // 2
 
-        size = self.bar.height if self.bar.horizontal else self.bar.width
+    def can_draw(self):
+        # Not before the bar has configured us, nor after finalize
+        return self.configured and self.drawer.ctx is not None
 
-        self.layout.draw(
-            (self.actual_padding or 0) - self._scroll_offset,
-            int(size / 2.0 - self.layout.height / 2.0) + self.hack_offset,
+    def draw(self):
+        if not self.can_draw():
+            return
+        breadth = self.bar.height if self.bar.horizontal else self.bar.width
+        draw_triangle(
+            self.drawer,
+            self.bar.horizontal,
+            0,
+            self.length,
+            breadth,
+            self.direction,
+            self.foreground,
+            self.background or self.bar.background,
         )
-        self.drawer.ctx.restore()
-
         self.drawer.draw(
-            # offsetx=self.offsetx, offsety=self.offsety - HACK_OFFSET, width=self.width, height=self.height + (HACK_OFFSET * 2)
             offsetx=self.offsetx,
             offsety=self.offsety,
             width=self.width,
             height=self.height,
         )
 
-        # We only want to scroll if:
-        # - User has asked us to scroll and the scroll width is smaller than the layout (should_scroll=True)
-        # - We are still scrolling (is_scrolling=True)
-        # - We haven't already queued the next scroll (scroll_queued=False)
-        if self._should_scroll and self._is_scrolling and not self._scroll_queued:
-            self._scroll_queued = True
-            if self._scroll_offset == 0:
-                interval = self.scroll_delay
-            else:
-                interval = self.scroll_interval
-            self._scroll_timer = self.timeout_add(interval, self.do_scroll)
-
 
 class DynamicTerminator(Terminator):
     def __init__(self, active_foreground: str, **config: Any):
         super().__init__(**config)
         self.active_foreground = active_foreground
         self.inactive_foreground = self.foreground
-
-    def draw(self):
-        super().draw()
+        self._active = None
 
     def _configure(self, qtile, bar):
-        base._TextBox._configure(self, qtile, bar)
+        super()._configure(qtile, bar)
         hook.subscribe.current_screen_change(self.update_text)
         self.update_text()
 
     def update_text(self):
-        if self.qtile.current_screen == self.bar.screen:
+        active = self.qtile.current_screen == self.bar.screen
+        if active == self._active:
+            return
+        self._active = active
+        if active:
             self.foreground = self.active_foreground
         else:
             self.foreground = self.inactive_foreground
-        self.draw()
+        redraws.mark(self)
+
+    def finalize(self):
+        hook.unsubscribe.current_screen_change(self.update_text)
+        redraws.forget(self)
+        super().finalize()
+
+
+class _AlignedTimers:
+    """
+    Run the widget's timers on the shared tick scheduler, on wall-clock
+    multiples of their delay, so they wake up together with other widgets.
+    """
+
+    def timeout_add(self, seconds, method, method_args=()):
+        if seconds <= 0:
+            # Nothing to align to. Kept out of _futures, qtile expects a
+            # deadline on everything in there and this runs on the next
+            # loop iteration anyway.
+            return self.qtile.call_soon(self._wrapper, method, *method_args)
+        handle = ticks.call_aligned(seconds, self._wrapper, method, *method_args)
+        self._futures.append(handle)
+        return handle
 
 
-class GenericVolume(GenPollText):
+class Clock(_AlignedTimers, BuiltinClock):
+    """Clock that by default updates on the minute unless it shows seconds."""
+
+    def __init__(self, **config):
+        super().__init__(**config)
+        if "update_interval" not in config:
+            self.update_interval = (
+                1 if any(f"%{c}" in self.format for c in "cSsTXr") else 60
+            )
+
+    def tick(self):
+        self.update(self.poll())
+        return self.update_interval
+
+
+class ThermalSensor(_AlignedTimers, BuiltinThermalSensor):
+    pass
+
+
+class _AdaptivePolling:
+    """
+    Poll every `min_interval` right after an interaction or a changed value,
+    then grow the interval by `backoff` on every poll that returns the same
+    text, up to `max_interval`.
+    """
+
+    defaults = [
+        ("min_interval", 0.2, "Poll interval after a change or an interaction"),
+        ("max_interval", 5, "Longest poll interval while the value is stable"),
+        ("backoff", 2, "Factor the interval grows by on every unchanged poll"),
+        (
+            "active_period",
+            10,
+            "Seconds after an interaction during which polling stays fast",
+        ),
+        ("clock", time.monotonic, "Time source, replaceable in tests"),
+    ]
+
+    def __init__(self, *args, **config):
+        super().__init__(*args, **config)
+        self.add_defaults(_AdaptivePolling.defaults)
+        self.update_interval = self.min_interval
+        self._last_activity = None
+        _adaptive_widgets.add(self)
+
+    def next_interval(self, changed: bool) -> float:
+        active = (
+            self._last_activity is not None
+            and self.clock() - self._last_activity < self.active_period
+        )
+        if changed or active:
+            return self.min_interval
+        return min(self.update_interval * self.backoff, self.max_interval)
+
+    def update(self, text):
+        changed = text != self.text
+        super().update(text)
+        self.update_interval = self.next_interval(changed)
+
+    def poke(self):
+        """Note input activity: poll now, and fast for `active_period`."""
+        self._last_activity = self.clock()
+        self._poll_now()
+
+    def _poll_now(self):
+        """Poll right away and back off again from `min_interval`."""
+        self.update_interval = self.min_interval
+        if not self.configured or getattr(self.bar, "suspended", False):
+            return
+        future = getattr(self, "future", None)
+        if future is not None and not future.done():
+            return
+        for timer in self._futures:
+            timer.cancel()
+        self._futures.clear()
+        self.timer_setup()
+
+    def button_press(self, x, y, button):
+        self.poke()
+        super().button_press(x, y, button)
+
+
+_adaptive_widgets: "weakref.WeakSet[_AdaptivePolling]" = weakref.WeakSet()
+
+
+def note_activity():
+    """Make every adaptive polling widget poll now and stay fast for a while."""
+    for widget in list(_adaptive_widgets):
+        widget.poke()
+
+
+class GenericVolume(_AdaptivePolling, _AlignedTimers, GenPollText):
+    defaults = [
+        (
+            "backend",
+            "events",
+            "'events' refreshes on PulseAudio/PipeWire sink changes, "
+            "'poll' polls pulsemixer, adaptively between min_interval and "
+            "max_interval",
+        ),
+        ("events", None, "Volume event source, defaults to `pactl subscribe`"),
+        ("fallback_interval", 30, "Safety poll interval while events are running"),
+        (
+            "volume_timeout",
+            1,
+            "Seconds to wait for pulsemixer before keeping the last known value",
+        ),
+    ]
+
     def __init__(self, **config):
         super().__init__(**config)
+        self.add_defaults(GenericVolume.defaults)
         self.volume = 0
         self.func = self._poll_func
-        self.update_interval = 0.2
         self._txt = ""
+        self.stale = False
+        self._refreshing = False
+        self._refresh_pending = False
+        if self.backend == "events" and self.events is None:
+            self.events = PactlEvents()
+        elif self.backend == "poll":
+            self.events = None
         self.mouse_callbacks = {
             **self.mouse_callbacks,
             "Button1": toggle_audio_profile,
@@ -178,17 +386,86 @@ class GenericVolume(GenPollText):
         }
 
     def _get_volume(self):
-        result = subprocess.check_output("pulsemixer --get-volume".split())
+        result = subprocess.check_output(
+            "pulsemixer --get-volume".split(), timeout=self.volume_timeout
+        )
         result = result.decode("utf-8").strip()
         return int(result.split()[0])
 
+    async def _config_async(self):
+        if self.events is not None:
+            self.events.subscribe(self._on_volume_event, self._on_events_ended)
+            self.events.start()
+
+    def finalize(self):
+        if self.events is not None:
+            self.events.unsubscribe(self._on_volume_event, self._on_events_ended)
+            self.events.stop()
+        # Reloading the config imports a new notifier, this one would keep
+        # its bus connection open. A widget still using it reconnects.
+        volume_notifier.close()
+        super().finalize()
+
+    def _on_volume_event(self):
+        self.qtile.call_soon_threadsafe(self._refresh)
+
+    def _on_events_ended(self):
+        # The next poll would otherwise be up to fallback_interval away
+        self.qtile.call_soon_threadsafe(self._poll_now)
+
+    def _refresh(self):
+        # Refreshed again once the running refresh is done, or on resume
+        if self._refreshing or getattr(self.bar, "suspended", False):
+            self._refresh_pending = True
+            return
+        self._refreshing = True
+        future = self.qtile.run_in_executor(self.poll)
+        future.add_done_callback(self._on_refreshed)
+
+    def _on_refreshed(self, future):
+        self._refreshing = False
+        if getattr(self.bar, "suspended", False):
+            self._refresh_pending = True
+            return
+        try:
+            self.update(future.result())
+        except Exception:
+            logger.exception("Failed to refresh volume")
+        if self._refresh_pending:
+            self._refresh_pending = False
+            self._refresh()
+
+    def resume(self):
+        if self._refresh_pending:
+            self._refresh_pending = False
+            self._refresh()
+
+    def next_interval(self, changed):
+        if self.events is not None and self.events.running:
+            return self.fallback_interval
+        return super().next_interval(changed)
+
     def _poll_func(self):
-        vol = self._get_volume()
+        try:
+            vol = self._get_volume()
+        except (subprocess.SubprocessError, OSError, ValueError):
+            # Keep the last known value on screen, a failed poll would
+            # otherwise stop the widget from rescheduling.
+            logger.warning("Could not read volume, keeping last known value")
+            self.stale = True
+            return self._txt
+        self.stale = False
         if vol != self.volume:
             self.volume = vol
             self._update_drawer()
         return self._txt
 
+    def info(self):
+        info = super().info()
+        info["volume"] = self.volume
+        info["stale"] = self.stale
+        return info
+
     def _update_drawer(self):
         full_block = "█"
         empty_block = "▓"
@@ -198,9 +475,7 @@ class GenericVolume(GenPollText):
         )
         self._txt = f"{progress_bar} {str(self.volume).rjust(3)}% "
 
-        subprocess.Popen(
-            f"dunstify Volume: -h int:value:{self.volume} -u LOW".split(" ")
-        )
+        volume_notifier.notify("Volume:", value=self.volume, urgency=URGENCY_LOW)
 
 
 class Volume(BuiltinVolume):
@@ -214,56 +489,333 @@ class Volume(BuiltinVolume):
         )
         self.text = f" {progress_bar} {str(self.volume).rjust(3)}%"
 
-        subprocess.Popen(["dunstify", f"Volume: ", "-h", f"int:value:{self.volume}"])
+        volume_notifier.notify("Volume:", value=self.volume)
 
+    def finalize(self):
+        volume_notifier.close()
+        super().finalize()
 
-def left_terminator(foreground, background, fontsize=26):
-    return Terminator(
-        fmt="",
-        foreground=foreground,
-        background=background,
-        fontsize=fontsize,
-        padding=0,
-        markup=False,
-        hack_offset=-1,
-        font="MesloLGS NF",
-    )
 
+class _SampledWidget:
+    """Draw from the shared metrics sampler instead of a private timer."""
 
-def right_terminator(foreground, background, fontsize=26):
-    return Terminator(
-        fmt="",
-        foreground=foreground,
-        background=background,
-        fontsize=fontsize,
-        padding=0,
-        markup=False,
-        hack_offset=0,
-        font="MesloLGS NF",
-    )
+    def timer_setup(self):
+        sampler.subscribe(self._on_sample)
+
+    def suspend(self):
+        sampler.unsubscribe(self._on_sample)
+
+    def resume(self):
+        sampler.subscribe(self._on_sample)
+
+    def finalize(self):
+        sampler.unsubscribe(self._on_sample)
+        super().finalize()
+
+
+class CPU(_SampledWidget, BuiltinCPU):
+    def poll(self):
+        variables = {"load_percent": round(sampler.cpu[-1], 1) if sampler.cpu else 0.0}
+        if "freq_" in self.format:
+            freq = psutil.cpu_freq()
+            variables["freq_current"] = round(freq.current / 1000, 1)
+            variables["freq_max"] = round(freq.max / 1000, 1)
+            variables["freq_min"] = round(freq.min / 1000, 1)
+        return self.format.format(**variables)
+
+    def _on_sample(self):
+        self.update(self.poll())
+
+
+class Memory(_SampledWidget, BuiltinMemory):
+    def poll(self):
+        if not sampler.memory:
+            return ""
+        mem = sampler.memory[-1]
+        val = {
+            "MemUsed": mem.used / self.calc_mem,
+            "MemTotal": mem.total / self.calc_mem,
+            "MemFree": mem.free / self.calc_mem,
+            "MemPercent": mem.percent,
+            "Buffers": mem.buffers / self.calc_mem,
+            "Active": mem.active / self.calc_mem,
+            "Inactive": mem.inactive / self.calc_mem,
+            "Shmem": mem.shared / self.calc_mem,
+            "mm": self.measure_mem,
+            "ms": self.measure_swap,
+        }
+        if "Swap" in self.format:
+            swap = psutil.swap_memory()
+            val["SwapTotal"] = swap.total / self.calc_swap
+            val["SwapFree"] = swap.free / self.calc_swap
+            val["SwapUsed"] = swap.used / self.calc_swap
+            val["SwapPercent"] = swap.percent
+        return self.format.format(**val)
+
+    def _on_sample(self):
+        self.update(self.poll())
+
+
+class Net(_SampledWidget, BuiltinNet):
+    """Net widget for all interfaces combined, fed by the shared sampler."""
+
+    def poll(self):
+        down = sampler.net_down[-1] if sampler.net_down else 0.0
+        up = sampler.net_up[-1] if sampler.net_up else 0.0
+        down, down_letter = self.convert_b(down)
+        up, up_letter = self.convert_b(up)
+        total, total_letter = self.convert_b(down + up)
+        down, up, total = self._format(
+            down, down_letter, up, up_letter, total, total_letter
+        )
+        return self.format.format(
+            interface="all",
+            down=down + down_letter,
+            up=up + up_letter,
+            total=total + total_letter,
+        )
+
+    def _on_sample(self):
+        self.update(self.poll())
+
+
+class _SampledGraph(_SampledWidget):
+    @abc.abstractmethod
+    def _samples(self) -> Iterable[float]:
+        """The sampler's history for this graph, oldest first."""
+
+    def _on_sample(self):
+        values = list(itertools.islice(reversed(list(self._samples())), self.samples))
+        self.values = values + [0] * (self.samples - len(values))
+        if not self.fixed_upper_bound:
+            self.maxvalue = max(self.values)
+        self.draw()
+
+
+class CPUGraph(_SampledGraph, BuiltinCPUGraph):
+    def _samples(self):
+        return sampler.cpu
+
+
+class MemoryGraph(_SampledGraph, BuiltinMemoryGraph):
+    def _samples(self):
+        return (
+            (mem.total - mem.free - mem.buffers - mem.cached) / 1024 / 1024
+            for mem in sampler.memory
+        )
+
+
+class NetGraph(_SampledGraph, BuiltinNetGraph):
+    """NetGraph for all interfaces combined, fed by the shared sampler."""
+
+    def _samples(self):
+        if self.bandwidth_type == "up":
+            return sampler.net_up
+        return sampler.net_down
+
+
+class Separator(NamedTuple):
+    direction: str
+    foreground: str
+    background: str
+    size: int = 24
+
+
+class PowerlineGroup(base._Widget):
+    """
+    Lay out widgets back to back with powerline separators between them.
+
+    The separators are painted by the group, in one pass on its own surface,
+    instead of each being a widget with its own drawer. Children keep their
+    drawers and timers and are registered with qtile like any bar widget;
+    the group places them and forwards mouse events to them. Stretching
+    children are not supported.
+    """
+
+    orientations = base.ORIENTATION_BOTH
+
+    def __init__(self, items: Sequence[Union[_Widget, Separator]], **config: Any):
+        super().__init__(bar.CALCULATED, **config)
+        self.items = list(items)
+        self._hovered: Optional[_Widget] = None
+
+    @property
+    def children(self) -> List[_Widget]:
+        return [item for item in self.items if not isinstance(item, Separator)]
+
+    @staticmethod
+    def _item_length(item: Union[_Widget, Separator]) -> int:
+        if isinstance(item, Separator):
+            return item.size // 2
+        return item.length
+
+    def calculate_length(self):
+        return sum(self._item_length(item) for item in self.items)
+
+    def _configure(self, qtile, bar):
+        super()._configure(qtile, bar)
+        for child in self.children:
+            # Also called when the bar is reconfigured, register only once
+            registered = child.configured
+            try:
+                child._configure(qtile, bar)
+            except Exception:
+                logger.exception("%s in powerline failed to configure", child.name)
+                self.items.remove(child)
+                continue
+            child.configured = True
+            if not registered:
+                qtile.register_widget(child)
+        self._place()
+
+    def _place(self) -> None:
+        position = 0
+        for item in self.items:
+            if not isinstance(item, Separator):
+                if self.bar.horizontal:
+                    item.offsetx = self.offsetx + position
+                    item.offsety = self.offsety
+                else:
+                    item.offsetx = self.offsetx
+                    item.offsety = self.offsety + position
+            position += self._item_length(item)
+
+    def draw(self):
+        self._place()
+        horizontal = self.bar.horizontal
+        breadth = self.bar.height if horizontal else self.bar.width
+        position = 0
+        for item in self.items:
+            length = self._item_length(item)
+            if isinstance(item, Separator):
+                # Only the separators are copied to the bar, the children
+                # paint their own areas
+                draw_triangle(
+                    self.drawer,
+                    horizontal,
+                    0,
+                    length,
+                    breadth,
+                    item.direction,
+                    item.foreground,
+                    item.background,
+                )
+                if horizontal:
+                    self.drawer.draw(
+                        offsetx=self.offsetx + position,
+                        offsety=self.offsety,
+                        width=length,
+                        height=self.height,
+                    )
+                else:
+                    self.drawer.draw(
+                        offsetx=self.offsetx,
+                        offsety=self.offsety + position,
+                        width=self.width,
+                        height=length,
+                    )
+            position += length
+        for child in self.children:
+            child.draw()
+
+    def _child_at(self, x: int, y: int) -> Tuple[Optional[_Widget], int, int]:
+        position = x if self.bar.horizontal else y
+        for child in self.children:
+            start = (
+                child.offsetx - self.offsetx
+                if self.bar.horizontal
+                else child.offsety - self.offsety
+            )
+            if start <= position < start + child.length:
+                if self.bar.horizontal:
+                    return child, x - start, y
+                return child, x, y - start
+        return None, x, y
+
+    def _relative(self, child: _Widget, x: int, y: int) -> Tuple[int, int]:
+        return (
+            x + self.offsetx - child.offsetx,
+            y + self.offsety - child.offsety,
+        )
+
+    def button_press(self, x, y, button):
+        child, x, y = self._child_at(x, y)
+        if child is not None:
+            child.button_press(x, y, button)
+
+    def button_release(self, x, y, button):
+        child, x, y = self._child_at(x, y)
+        if child is not None:
+            child.button_release(x, y, button)
+
+    def mouse_enter(self, x, y):
+        self.mouse_move(x, y)
+
+    def mouse_move(self, x, y):
+        child, child_x, child_y = self._child_at(x, y)
+        if child is self._hovered:
+            return
+        if self._hovered is not None:
+            self._hovered.mouse_leave(*self._relative(self._hovered, x, y))
+        self._hovered = child
+        if child is not None:
+            child.mouse_enter(child_x, child_y)
+
+    def mouse_leave(self, x, y):
+        if self._hovered is not None:
+            self._hovered.mouse_leave(*self._relative(self._hovered, x, y))
+            self._hovered = None
+
+    def _items(self, name):
+        if name == "widget":
+            return True, [child.name for child in self.children]
+        return super()._items(name)
+
+    def _select(self, name, sel):
+        if name == "widget":
+            for child in self.children:
+                if child.name == sel:
+                    return child
+            return None
+        return super()._select(name, sel)
+
+    def info(self):
+        info = super().info()
+        info["children"] = [child.info() for child in self.children]
+        return info
+
+    def finalize(self):
+        # Children are registered before the group, so when qtile finalizes
+        # every widget on reload it has already done theirs. When only this
+        # bar's screen goes away, they are finalized and unregistered here.
+        widgets_map = getattr(self.qtile, "widgets_map", {})
+        for child in self.children:
+            if child.drawer.ctx is None:
+                continue
+            child.finalize()
+            for name, widget in list(widgets_map.items()):
+                if widget is child:
+                    del widgets_map[name]
+        super().finalize()
 
 
 class RightPowerline:
     def __init__(
         self,
-        *widgets: List[_Widget],
+        *widgets: _Widget,
         terminator_size: int = 24,
         background: str = kanagawa.base00,
     ) -> None:
-        self._widgets = []
-        first = widgets[0]
-        self._widgets.append(
-            left_terminator(first.background, background, terminator_size)
-        )
-        for i in range(len(widgets)):
-            current = widgets[i]
-            self._widgets.append(current)
-            if i == len(widgets) - 1:
-                break
-            next = widgets[i + 1]
-            self._widgets.append(
-                left_terminator(next.background, current.background, terminator_size)
+        items: List[Union[_Widget, Separator]] = [
+            Separator("left", widgets[0].background, background, terminator_size)
+        ]
+        for current, next in zip(widgets, widgets[1:]):
+            items.append(current)
+            items.append(
+                Separator("left", next.background, current.background, terminator_size)
             )
+        items.append(widgets[-1])
+        self._widgets = [PowerlineGroup(items)]
 
     @property
     def widgets(self) -> List[_Widget]:
@@ -277,54 +829,98 @@ class LeftPowerline:
         terminator_size: int = 24,
         background: str = kanagawa.base00,
     ) -> None:
-        self._widgets = []
-        for i in range(len(widgets)):
-            current = widgets[i]
-            if isinstance(current, Iterable):
-                current = current[0]
-                for w in widgets[i]:
-                    self._widgets.append(w)
-            else:
-                self._widgets.append(current)
-            if i == len(widgets) - 1:
-                break
-            next = widgets[i + 1]
-            if isinstance(next, Iterable):
-                next = next[0]
-            self._widgets.append(
-                right_terminator(current.background, next.background, terminator_size)
+        segments = [
+            tuple(current) if isinstance(current, Iterable) else (current,)
+            for current in widgets
+        ]
+        items: List[Union[_Widget, Separator]] = []
+        for current, next in zip(segments, segments[1:]):
+            items.extend(current)
+            items.append(
+                Separator(
+                    "right", current[0].background, next[0].background, terminator_size
+                )
             )
-        last = widgets[-1]
-        if isinstance(last, Iterable):
-            last = last[-1]
-        self._widgets.append(
-            right_terminator(last.background, background, terminator_size)
+        items.extend(segments[-1])
+        items.append(
+            Separator("right", segments[-1][-1].background, background, terminator_size)
         )
+        self._widgets = [PowerlineGroup(items)]
 
     @property
     def widgets(self) -> List[_Widget]:
         return self._widgets
 
 
-def _parse_text(text: str):
-    text = text.lower()
-    if " - " in text:
-        text = text.split(" - ")[-1]
-    if "google chrome" in text:
-        text = "chrome"
-    elif "firefox" in text:
-        text = "firefox"
-    elif "visual studio code" in text:
-        text = "vscode"
-    elif "edge" in text:
-        text = "edge"
-    elif "nvim" in text:
-        text = text.split("/")[-1]
-    return text.lower()
+def _title_parser() -> TitleParser:
+    try:
+        return TitleParser([*load_rules(TITLE_RULES), *DEFAULT_RULES])
+    except re.error:
+        logger.exception("Title rules do not compile, using the default ones")
+        return TitleParser(DEFAULT_RULES)
+
+
+_parse_text = _title_parser()
+
+
+class TaskList(BuiltinTaskList):
+    """
+    TaskList that redraws at most once per `redraw_interval`, and only when
+    an entry it shows changed.
+
+    Every title change of every window reaches the task list of every bar.
+    Changes to windows of other groups are dropped, and the rest are
+    collapsed into one comparison with the entries last drawn, so a tab
+    spinning its title, or changing a part the title rules strip, does not
+    relayout the list.
+    """
+
+    defaults = [
+        ("redraw_interval", 1 / 60, "Minimum seconds between redraws"),
+    ]
+
+    def __init__(self, **config):
+        super().__init__(**config)
+        self.add_defaults(TaskList.defaults)
+        self._entries = None
+        self._last_draw = 0.0
+        self._handle = None
+
+    def update(self, window=None):
+        if window is not None and window not in self.windows:
+            return
+        if self._handle is not None:
+            return
+        delay = self._last_draw + self.redraw_interval - time.monotonic()
+        self._handle = self.qtile.call_later(max(0.0, delay), self._refresh)
+
+    def _snapshot(self):
+        current = self.bar.screen.group.current_window
+        return tuple(
+            (self.get_taskname(window), window.urgent, window is current)
+            for window in self.windows
+        )
+
+    def _refresh(self):
+        self._handle = None
+        if self._snapshot() != self._entries:
+            redraws.mark(self)
+
+    def draw(self):
+        self._entries = self._snapshot()
+        self._last_draw = time.monotonic()
+        super().draw()
+
+    def finalize(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        redraws.forget(self)
+        super().finalize()
 
 
 def shared_task_list():
-    return widget.TaskList(
+    return TaskList(
         parse_text=_parse_text,
         background=kanagawa.base00,
         foreground=kanagawa.base05,